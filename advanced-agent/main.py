@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 from src.workflow import Workflow
+from src.utils import run_sync
 from rich.console import Console
 
 from rich.panel import Panel
@@ -10,6 +11,7 @@ from rich import print as rprint
 from rich.markdown import Markdown
 import json
 import datetime
+import asyncio
 
 load_dotenv()
 
@@ -275,6 +277,17 @@ def show_detailed_analysis(analysis):
         console.print(f"[bold {score_color}]⭐ Recommendation Score: {analysis.recommendation_score}/10[/bold {score_color}]\n")
 
 
+def show_market_leaders(category, market_leaders):
+    """Display market leaders as a single block so it doesn't interleave with research output"""
+    if not market_leaders:
+        return
+
+    lines = [f"\n[bold blue]🏆 Top Market Leaders in {category.title()}:[/bold blue]", "─" * 60]
+    for i, leader in enumerate(market_leaders, 1):
+        lines.append(f"[bold cyan]{i}.[/bold cyan] [green]{leader}[/green]")
+    console.print("\n".join(lines) + "\n")
+
+
 def show_comparison_matrix(comparison):
     """Display comparison matrix with simple text formatting"""
     console.print(f"\n[bold blue]⚖️ Tool Comparison Matrix[/bold blue]")
@@ -289,6 +302,23 @@ def show_comparison_matrix(comparison):
         console.print("[red]❌ No comparison data available[/red]")
 
 
+async def research(workflow, query, category):
+    """Run market-leader discovery and the research graph side by side on one event loop.
+
+    The leaders panel prints as soon as it is ready; both share the same Firecrawl session.
+    """
+    async def leaders():
+        try:
+            show_market_leaders(category, await workflow.aget_market_leaders(category, query=query))
+        except Exception as e:
+            console.print(f"[red]❌ Error getting market leaders: {e}[/red]")
+
+    leaders_task = asyncio.create_task(leaders())
+    result = await workflow.arun(query)
+    await leaders_task
+    return result
+
+
 def main():
     workflow = Workflow()
 
@@ -316,18 +346,8 @@ def main():
             continue
 
         if query:
-            # First, show market leaders in this category
             category = query.replace("alternate for", "").replace("alternative to", "").replace("tools for", "").strip()
-            market_leaders = workflow.get_market_leaders(category)
-
-            if market_leaders:
-                console.print(f"\n[bold blue]🏆 Top Market Leaders in {category.title()}:[/bold blue]")
-                console.print("─" * 60)
-                for i, leader in enumerate(market_leaders, 1):
-                    console.print(f"[bold cyan]{i}.[/bold cyan] [green]{leader}[/green]")
-                console.print()
-
-            result = workflow.run(query)
+            result = run_sync(research(workflow, query, category))
 
             # Results header
             console.print(f"\n[bold green]📊 Results for:[/bold green] [yellow]{query}[/yellow]")
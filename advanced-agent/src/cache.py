@@ -0,0 +1,205 @@
+import os
+import re
+import asyncio
+import time
+import zlib
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+
+# Query parameters that never change page content (tracking, analytics)
+TRACKING_PARAMS = {"ref", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+
+def cache_enabled() -> bool:
+    """Caching can be switched off globally with CACHE_ENABLED=false"""
+    return os.getenv("CACHE_ENABLED", "true").lower() not in {"false", "0", "no"}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share one cache entry"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":443") or host.endswith(":80"):
+        host = host.rsplit(":", 1)[0]
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (key.lower().startswith("utm_") or key.lower() in TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query's case, punctuation and whitespace; word order is meaningful and kept"""
+    words = re.findall(r"[a-z0-9+#./-]+", (query or "").lower())
+    return " ".join(word for word in (word.strip("./-") for word in words) if word)
+
+
+def content_key(*parts: str) -> str:
+    """Stable content-addressed key for any combination of strings"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Persistent key/value cache backed by SQLite.
+
+    Values are zlib-compressed strings with a per-entry TTL. When the total
+    compressed size exceeds ``max_bytes`` the least recently used entries are
+    evicted. A fresh connection is opened per operation, so one cache file can
+    be shared safely by threads and by separate worker processes. Async code uses
+    ``aget``/``aset``/``adelete``, which run the same work on a worker thread so a
+    locked file or a large page never stalls the event loop.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int = 86400, max_bytes: int = 200 * 1024 * 1024,
+                 cache_dir: Optional[str] = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir or os.getenv("CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.path = os.path.join(self.cache_dir, f"{namespace}.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                       key TEXT PRIMARY KEY,
+                       value BLOB NOT NULL,
+                       size INTEGER NOT NULL,
+                       created_at REAL NOT NULL,
+                       expires_at REAL NOT NULL,
+                       accessed_at REAL NOT NULL
+                   )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None when missing or expired"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                value, expires_at = row
+                if expires_at <= now:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return zlib.decompress(value).decode("utf-8")
+        except (sqlite3.Error, zlib.error):
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        """Store a value and evict least recently used entries if over budget"""
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        blob = zlib.compress(value.encode("utf-8"), 6)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, created_at, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now, now + ttl, now)
+                )
+                self._evict(conn, now)
+        except sqlite3.Error:
+            pass
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        await asyncio.to_thread(self.set, key, value, ttl_seconds)
+
+    async def adelete(self, key: str):
+        await asyncio.to_thread(self.delete, key)
+
+    def values(self) -> Iterator[str]:
+        """Iterate over every live value, oldest first, without touching LRU order"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT value FROM entries WHERE expires_at > ? ORDER BY created_at", (now,)
+            ).fetchall()
+        for (value,) in rows:
+            try:
+                yield zlib.decompress(value).decode("utf-8")
+            except zlib.error:
+                continue
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall():
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus on-disk totals"""
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -0,0 +1,101 @@
+import re
+from typing import Iterable, Iterator, Tuple
+from .tokens import estimate_tokens
+
+IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINK = re.compile(r"\[([^\]]*)\]\((?:[^()\s]|\([^)]*\))*(?:\s+\"[^\"]*\")?\)")
+EMPTY_LINK = re.compile(r"\[\s*\]\([^)]*\)")
+BARE_URL = re.compile(r"^\W*(?:https?://|www\.)\S+\W*$")
+HTML_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+WORD = re.compile(r"[A-Za-z0-9]")
+
+# Short lines matching these are banners, consent prompts, nav chrome or footer boilerplate
+BOILERPLATE = re.compile(
+    r"we use cookies|(?:site|website) uses cookies|accept (?:all )?cookies|cookie (?:settings|preferences|policy|consent)"
+    r"|accept all|reject all|manage (?:preferences|consent)|privacy policy|terms of (?:service|use)"
+    r"|all rights reserved|©|copyright \d{4}|skip to (?:main )?content|toggle (?:navigation|menu)"
+    r"|subscribe to (?:our|the) newsletter|sign up for (?:our|the) newsletter|back to top|open menu|close menu",
+    re.IGNORECASE
+)
+BOILERPLATE_MAX_WORDS = 25
+# Link text longer than this carries content ("Pricing starts at $29/month") rather than navigation
+NAV_LINK_MAX_WORDS = 5
+# Only sentences this long are deduplicated; short repeats ("Unlimited builds") are often plan details
+DEDUPE_MIN_WORDS = 4
+# Headings and whole-line bold titles ("**Enterprise**") start a new section for deduplication
+SECTION_TITLE = re.compile(r"^(?:#|(\*\*|__).+\1:?$)")
+
+
+def _is_nav_line(line: str) -> bool:
+    """A line made only of two or more short links (menus, breadcrumbs, footer link lists).
+
+    Headings and single-link list items are never navigation: listicles name each
+    tool as a linked heading or bullet, and extraction needs those names.
+    """
+    if line.startswith("#"):
+        return False
+    links = LINK.findall(line)
+    if len(links) < 2:
+        return False
+    remainder = LINK.sub("", line)
+    if WORD.search(remainder):
+        return False
+    return all(len(text.split()) <= NAV_LINK_MAX_WORDS for text in links)
+
+
+def iter_clean_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Stream markdown lines with boilerplate removed, one line at a time.
+
+    Repeated sentences are only dropped within one section: pricing tiers each list
+    their own features, and a later tier repeating "SSO with SAML providers" is content.
+    """
+    seen = set()
+    blank = True
+    for raw in lines:
+        line = HTML_TAG.sub("", IMAGE.sub("", raw.rstrip()))
+        line = EMPTY_LINK.sub("", line)
+
+        stripped = line.strip()
+        if not WORD.search(stripped):
+            if stripped.startswith("|") and stripped.endswith("|") and "-" in stripped:
+                # Table header separator; the table's rows depend on it
+                yield line
+                blank = False
+            elif not blank:
+                # Empty or separator-only leftovers (bullets, rules) collapse into one blank line
+                yield ""
+                blank = True
+            continue
+
+        if _is_nav_line(stripped) or BARE_URL.match(stripped):
+            continue
+
+        line = LINK.sub(lambda match: match.group(1), line)
+        words = line.split()
+        if len(words) <= BOILERPLATE_MAX_WORDS and BOILERPLATE.search(line):
+            continue
+
+        if SECTION_TITLE.match(line.strip()):
+            seen = set()
+
+        if len(words) >= DEDUPE_MIN_WORDS and not stripped.startswith(("#", "|")):
+            signature = " ".join(words).lower()
+            if signature in seen:
+                continue
+            seen.add(signature)
+
+        yield line
+        blank = False
+
+
+def clean_markdown(markdown: str) -> str:
+    """Strip images, link-only nav lines, banners, footers and repeated blocks from page markdown"""
+    if not markdown:
+        return ""
+    return "\n".join(iter_clean_lines(markdown.splitlines())).strip()
+
+
+def clean_with_report(markdown: str) -> Tuple[str, int, int]:
+    """Clean markdown and return (cleaned, tokens before, tokens after)"""
+    cleaned = clean_markdown(markdown)
+    return cleaned, estimate_tokens(markdown or ""), estimate_tokens(cleaned)
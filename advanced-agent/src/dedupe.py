@@ -0,0 +1,68 @@
+import random
+import hashlib
+from typing import List, Optional, Tuple
+from .relevance import terms
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+# Texts shorter than this (in terms) are too small to fingerprint reliably
+MIN_TERMS = 40
+
+MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed: signatures must be comparable across calls and processes
+_rng = random.Random(0x5EED)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def shingle_hashes(text: str, shingle_size: int = SHINGLE_SIZE) -> set:
+    words = terms(text or "")
+    if len(words) < MIN_TERMS:
+        return set()
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + shingle_size]).encode("utf-8"), digest_size=8).digest(), "big")
+        for i in range(len(words) - shingle_size + 1)
+    }
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature over word shingles; None when the text is too short to judge"""
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """Remembers signatures of texts seen so far and flags ones that nearly repeat them"""
+
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+        self.entries = []
+
+    def check(self, text: str, label: str) -> Optional[str]:
+        """Return the label of an earlier near-identical text, or record this one and return None"""
+        signature = minhash(text)
+        if signature is None:
+            return None
+        for other, other_label in self.entries:
+            if similarity(signature, other) >= self.threshold:
+                return other_label
+        self.entries.append((signature, label))
+        return None
+
+
+def near_duplicates(texts: List[str], threshold: float = 0.6) -> List[Optional[int]]:
+    """For each text, the index of an earlier text it nearly duplicates (else None)"""
+    index = NearDuplicateIndex(threshold)
+    matches = []
+    for i, text in enumerate(texts):
+        duplicate = index.check(text, str(i))
+        matches.append(int(duplicate) if duplicate is not None else None)
+    return matches
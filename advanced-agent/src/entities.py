@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from .cache import normalize_url
+
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(__file__), "data", "tool_aliases.json")
+
+# Trailing words that don't change which product a name refers to
+GENERIC_WORDS = {"inc", "llc", "ltd", "hq", "official", "platform", "software"}
+# "GitLab CI", "CircleCI" and "Circle CI" name the product without the suffix
+CI_SUFFIXES = ("cicd", "ci")
+# Keys shorter than this only ever match exactly; trigrams say little about them
+MIN_FUZZY_LENGTH = 4
+
+
+def normalize_name(name: str) -> str:
+    """Comparison key for a tool name: 'VS Code', 'vs-code' and 'VSCode' all give 'vscode'"""
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode().lower()
+    # Keep C, C++ and C# apart
+    text = text.replace("+", " plus ").replace("#", " sharp ")
+    tokens = re.findall(r"[a-z0-9]+", text)
+    while len(tokens) > 1 and tokens[-1] in GENERIC_WORDS:
+        tokens.pop()
+    key = "".join(tokens)
+    for suffix in CI_SUFFIXES:
+        if key.endswith(suffix) and len(key) - len(suffix) >= 3:
+            return key[:-len(suffix)]
+    return key
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def canonical_url(url: str) -> str:
+    """Host and path of a site URL, ignoring scheme, 'www.', trailing slashes and tracking parameters"""
+    normalized = normalize_url(url)
+    if not normalized:
+        return ""
+    parts = urlsplit(normalized)
+    return f"{parts.netloc}{parts.path.rstrip('/')}"
+
+
+def load_aliases(path: Optional[str] = None) -> Dict[str, str]:
+    """Map of normalized alias -> normalized canonical name from the alias table"""
+    path = path or os.getenv("TOOL_ALIASES_PATH", DEFAULT_ALIASES_PATH)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    aliases = {}
+    for canonical, spellings in data.get("aliases", {}).items():
+        key = normalize_name(canonical)
+        for spelling in spellings:
+            aliases[normalize_name(spelling)] = key
+    return aliases
+
+
+_aliases = None
+
+
+def get_aliases() -> Dict[str, str]:
+    """Process-wide alias table, loaded on first use"""
+    global _aliases
+    if _aliases is None:
+        try:
+            _aliases = load_aliases()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Tool aliases failed to load, matching names without them: {e}")
+            _aliases = {}
+    return _aliases
+
+
+def entity_key(name: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """Normalized key for a tool name with aliases folded into their canonical product"""
+    key = normalize_name(name)
+    aliases = get_aliases() if aliases is None else aliases
+    return aliases.get(key, key)
+
+
+class EntityResolver:
+    """Decides when two tool names, or two official sites, are the same product.
+
+    Names are matched through the alias table, then by exact normalized key, then by
+    trigram similarity of the keys (catching typos and spacing variants). Sites are
+    matched by canonical URL. One resolver covers one research run; the first name
+    seen for an entity is the one kept.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, threshold: Optional[float] = None):
+        self.aliases = get_aliases() if aliases is None else aliases
+        self.threshold = threshold if threshold is not None else float(os.getenv("ENTITY_SIMILARITY", "0.75"))
+        self.names: Dict[str, str] = {}  # entity key -> first name seen
+        self.index: Dict[str, Set[str]] = {}  # trigram -> entity keys
+        self.sites: Dict[str, str] = {}  # canonical URL -> entity key
+
+    def key(self, name: str) -> str:
+        return entity_key(name, self.aliases)
+
+    def find(self, name: str) -> Optional[str]:
+        """Key of an already-seen entity this name refers to, if any"""
+        key = self.key(name)
+        if key in self.names:
+            return key
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+
+        grams = trigrams(key)
+        shared = Counter(other for gram in grams for other in self.index.get(gram, ()))
+        best, best_score = None, 0.0
+        for other, overlap in shared.items():
+            score = overlap / (len(grams) + len(trigrams(other)) - overlap)
+            if score > best_score:
+                best, best_score = other, score
+        return best if best_score >= self.threshold else None
+
+    def add(self, name: str) -> Optional[str]:
+        """Record a name; returns the earlier name it duplicates, or None if it is new"""
+        existing = self.find(name)
+        if existing is not None:
+            return self.names[existing]
+        key = self.key(name)
+        if not key:
+            return None
+        self.names[key] = name
+        if len(key) >= MIN_FUZZY_LENGTH:
+            for gram in trigrams(key):
+                self.index.setdefault(gram, set()).add(key)
+        return None
+
+    def dedupe(self, names: Iterable[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Distinct names in order, plus (dropped, kept) pairs for each duplicate"""
+        unique, merged = [], []
+        for name in names:
+            duplicate_of = self.add(name)
+            if duplicate_of is None:
+                unique.append(name)
+            else:
+                merged.append((name, duplicate_of))
+        return unique, merged
+
+    def claim_site(self, name: str, url: str) -> Optional[str]:
+        """Tie a name to its official site; returns the name that already claimed the site, if another"""
+        site = canonical_url(url)
+        if not site:
+            return None
+        key = self.find(name) or self.key(name)
+        owner = self.sites.setdefault(site, key)
+        if owner == key:
+            return None
+        return self.names.get(owner, owner)
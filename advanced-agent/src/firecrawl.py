@@ -1,7 +1,17 @@
 import os
-import time
-from firecrawl import FirecrawlApp, ScrapeOptions
+import json
+import asyncio
+from typing import List, Optional
+from firecrawl import AsyncFirecrawlApp, ScrapeOptions
+from firecrawl.firecrawl import ScrapeResponse, SearchResponse
 from dotenv import load_dotenv
+from .cleaning import clean_markdown, clean_with_report
+from .dedupe import NearDuplicateIndex
+from .cache import DiskCache, cache_enabled, content_key, normalize_url, normalize_query
+from .rate_limit import get_rate_limiter
+from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .singleflight import SingleFlight
+from .utils import run_sync
 
 load_dotenv()
 
@@ -11,58 +21,294 @@ class FirecrawlService:
         api_key = os.getenv("FIRECRAWL_API_KEY")
         if not api_key:
             raise ValueError("Missing FIRECRAWL_API_KEY environment variable")
-        self.app = FirecrawlApp(api_key=api_key)
-        self.max_retries = 3
-        self.retry_delay = 2  # seconds
+        self.async_app = AsyncFirecrawlApp(api_key=api_key)
+        # Exponential backoff with jitter; a breaker per endpoint makes later calls fail
+        # fast once Firecrawl is clearly down instead of each walking its own retry ladder
+        self.retry_policy = RetryPolicy(
+            max_attempts=int(os.getenv("FIRECRAWL_MAX_RETRIES", "3")),
+            base_delay=float(os.getenv("FIRECRAWL_RETRY_BASE_DELAY", "1")),
+            max_delay=float(os.getenv("FIRECRAWL_RETRY_MAX_DELAY", "30"))
+        )
+        self.breakers = {
+            endpoint: CircuitBreaker(
+                f"firecrawl-{endpoint}",
+                failure_threshold=int(os.getenv("FIRECRAWL_BREAKER_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("FIRECRAWL_BREAKER_RESET", "30"))
+            )
+            for endpoint in ("search", "scrape")
+        }
+        # Search hits shorter than this are treated as missing and re-scraped
+        self.min_embedded_markdown = int(os.getenv("MIN_EMBEDDED_MARKDOWN_CHARS", "500"))
+        # Strip nav, images, banners and footers before page text reaches a prompt
+        self.clean_pages = os.getenv("CLEAN_MARKDOWN", "true").lower() not in {"false", "0", "no"}
+        self.tokens_saved = 0
+        self._cleaned_urls = set()
+        # Syndicated or near-identical articles (MinHash Jaccard estimate) are dropped from batches
+        self.dedupe_articles = os.getenv("DEDUPE_ARTICLES", "true").lower() not in {"false", "0", "no"}
+        self.dedupe_threshold = float(os.getenv("DEDUPE_THRESHOLD", "0.5"))
+        # Deadline for a batch of concurrent article fetches
+        self.request_timeout = float(os.getenv("REQUEST_TIMEOUT", "30"))
+
+        # Proactive client-side limit, shared with other workers through the bucket file
+        self.rate_limiter = get_rate_limiter()
+        self.requests_per_minute = float(os.getenv("FIRECRAWL_RPM", "20"))
+
+        # Concurrent identical searches and scrapes from every caller of this service (e.g.
+        # market leaders and the research graph running side by side) share one request;
+        # finished results are only kept by the disk caches below, under their TTLs
+        self.inflight = SingleFlight()
+
+        # Persistent scrape cache - vendor pages rarely change within a day
+        # Search results are cached more briefly since rankings shift faster than page content
+        self.scrape_cache = None
+        self.search_cache = None
+        if cache_enabled():
+            self.scrape_cache = DiskCache(
+                "scrape",
+                ttl_seconds=int(os.getenv("SCRAPE_CACHE_TTL", "86400")),
+                max_bytes=int(os.getenv("SCRAPE_CACHE_MAX_MB", "200")) * 1024 * 1024
+            )
+            self.search_cache = DiskCache(
+                "search",
+                ttl_seconds=int(os.getenv("SEARCH_CACHE_TTL", "21600")),
+                max_bytes=int(os.getenv("SEARCH_CACHE_MAX_MB", "50")) * 1024 * 1024
+            )
 
     def search_companies(self, query: str, num_results: int = 5):
-        """Search for companies with retry mechanism"""
-        for attempt in range(self.max_retries):
-            try:
-                result = self.app.search(
-                    query=f"{query} company pricing",
-                    limit=num_results,
-                    scrape_options=ScrapeOptions(
-                        formats=["markdown"]
-                    )
-                )
-                return result
-            except Exception as e:
-                error_str = str(e).lower()
-                if attempt < self.max_retries - 1:
-                    if "502" in error_str or "503" in error_str or "timeout" in error_str:
-                        print(f"⚠️ Firecrawl server error (attempt {attempt + 1}/{self.max_retries}), retrying in {self.retry_delay}s...")
-                        time.sleep(self.retry_delay)
-                        continue
-                    elif "rate" in error_str or "429" in error_str:
-                        print(f"⚠️ Firecrawl rate limit (attempt {attempt + 1}/{self.max_retries}), waiting {self.retry_delay * 2}s...")
-                        time.sleep(self.retry_delay * 2)
-                        continue
-
-                print(f"❌ Firecrawl search failed: {e}")
-                return []
+        """Synchronous wrapper around asearch_companies"""
+        return run_sync(self.asearch_companies(query, num_results))
 
     def scrape_company_pages(self, url: str):
-        """Scrape company pages with retry mechanism"""
-        for attempt in range(self.max_retries):
-            try:
-                result = self.app.scrape_url(
-                    url,
+        """Synchronous wrapper around ascrape_company_pages"""
+        return run_sync(self.ascrape_company_pages(url))
+
+    def get_page_content(self, result) -> str:
+        """Synchronous wrapper around aget_page_content"""
+        return run_sync(self.aget_page_content(result))
+
+    def get_page_contents(self, results, timeout: Optional[float] = None) -> List[str]:
+        """Synchronous wrapper around aget_page_contents"""
+        return run_sync(self.aget_page_contents(results, timeout))
+
+    async def asearch_companies(self, query: str, num_results: int = 5):
+        """Search for companies with retry mechanism, served from the search cache when fresh"""
+        full_query = f"{query} company pricing"
+        key = ("search", normalize_query(full_query), num_results)
+        return await self.inflight.do(key, lambda: self._search(full_query, num_results))
+
+    async def _search(self, full_query: str, num_results: int):
+        cached = await self._get_cached_search(full_query, num_results)
+        if cached:
+            return cached
+
+        async def call():
+            await self.rate_limiter.acquire("firecrawl:requests", self.requests_per_minute)
+            response = await self.async_app.search(
+                query=full_query,
+                limit=num_results,
+                scrape_options=ScrapeOptions(
                     formats=["markdown"]
                 )
-                return result
-            except Exception as e:
-                error_str = str(e).lower()
-                if attempt < self.max_retries - 1:
-                    if "502" in error_str or "503" in error_str or "timeout" in error_str:
-                        print(f"⚠️ Firecrawl server error scraping {url} (attempt {attempt + 1}/{self.max_retries}), retrying in {self.retry_delay}s...")
-                        time.sleep(self.retry_delay)
-                        continue
-                    elif "rate" in error_str or "429" in error_str:
-                        print(f"⚠️ Firecrawl rate limit scraping {url} (attempt {attempt + 1}/{self.max_retries}), waiting {self.retry_delay * 2}s...")
-                        time.sleep(self.retry_delay * 2)
-                        continue
-
-                print(f"❌ Firecrawl scrape failed for {url}: {e}")
-                return None
+            )
+            # Unlike the sync client, AsyncFirecrawlApp.search returns the raw JSON body
+            if isinstance(response, SearchResponse):
+                return response
+            if response.get("success") and "data" in response:
+                return SearchResponse(**response)
+            # Raised so the retry policy classifies it like any other failed request
+            raise Exception(f"Search failed. Error: {response.get('error', response)}")
+
+        try:
+            result = await self.retry_policy.run(
+                call, self.breakers["search"], on_retry=lambda *args: self._on_retry("search", *args)
+            )
+        except CircuitOpenError:
+            print("⚡ Firecrawl search skipped: service is failing, circuit breaker open")
+            return []
+        except Exception as e:
+            print(f"❌ Firecrawl search failed: {e}")
+            return []
+
+        await self._store_cached_search(full_query, num_results, result)
+        return result
+
+    async def ascrape_company_pages(self, url: str):
+        """Scrape company pages with retry mechanism, served from the scrape cache when fresh"""
+        return await self.inflight.do(("scrape", normalize_url(url)), lambda: self._scrape(url))
+
+    async def _scrape(self, url: str):
+        cache_key = content_key(normalize_url(url))
+        cached = await self._get_cached_page(cache_key)
+        if cached:
+            return cached
+
+        async def call():
+            await self.rate_limiter.acquire("firecrawl:requests", self.requests_per_minute)
+            return await self.async_app.scrape_url(
+                url,
+                formats=["markdown"]
+            )
+
+        try:
+            result = await self.retry_policy.run(
+                call, self.breakers["scrape"], on_retry=lambda *args: self._on_retry(f"scrape of {url}", *args)
+            )
+        except CircuitOpenError:
+            print(f"⚡ Firecrawl scrape skipped for {url}: service is failing, circuit breaker open")
+            return None
+        except Exception as e:
+            print(f"❌ Firecrawl scrape failed for {url}: {e}")
+            return None
+
+        await self._store_cached_page(cache_key, url, result)
+        return result
+
+    def clean_page(self, markdown: str, url: str = "") -> str:
+        """Boilerplate-free page text; the raw markdown stays in the caches"""
+        if not self.clean_pages or not markdown:
+            return markdown or ""
+        cleaned, before, after = clean_with_report(markdown)
+        if url not in self._cleaned_urls:
+            if url:
+                self._cleaned_urls.add(url)
+            self.tokens_saved += before - after
+            if before > after:
+                print(f"🧹 Cleaned {url or 'page'}: {before:,} → {after:,} tokens ({(before - after) * 100 // before}% saved)")
+        return cleaned
+
+    async def aget_page_content(self, result) -> str:
+        """Return cleaned page markdown for a search hit, scraping only when search didn't embed enough"""
+        url = result.get("url", "")
+        markdown = result.get("markdown") or ""
+        if len(markdown.strip()) >= self.min_embedded_markdown:
+            # Seed the scrape cache so later detailed analyses of this URL skip Firecrawl too
+            if url:
+                await self._store_cached_page(content_key(normalize_url(url)), url, ScrapeResponse(
+                    url=url, markdown=markdown, metadata=result.get("metadata")
+                ))
+            return self.clean_page(markdown, url)
+
+        if not url:
+            return self.clean_page(markdown)
+        scraped = await self.ascrape_company_pages(url)
+        if scraped and scraped.markdown:
+            return self.clean_page(scraped.markdown, url)
+        return self.clean_page(markdown, url)
+
+    async def aget_page_contents(self, results, timeout: Optional[float] = None) -> List[str]:
+        """Fetch content for several search hits concurrently, in the original order.
+
+        Pages that haven't arrived when the deadline passes come back as "" so a
+        single slow site can't hold up the whole batch. Repeated URLs and near-duplicate
+        articles also come back as "": hits whose search snippet already matches an
+        earlier hit are never scraped, and fetched pages are compared once more.
+        """
+        results = list(results or [])
+        if not results:
+            return []
+        deadline = self.request_timeout if timeout is None else timeout
+
+        skip = self._duplicate_hits(results)
+        tasks = [
+            None if i in skip else asyncio.ensure_future(self.aget_page_content(result))
+            for i, result in enumerate(results)
+        ]
+        started = [task for task in tasks if task]
+        done, pending = await asyncio.wait(started, timeout=deadline) if started else (set(), set())
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            print(f"⚠️ {len(pending)} of {len(started)} pages missed the {deadline:g}s deadline, continuing without them")
+
+        contents = []
+        for task in tasks:
+            if task in done and not task.cancelled() and not task.exception():
+                contents.append(task.result() or "")
+            else:
+                contents.append("")
+
+        # Full pages can reveal duplicates the snippets didn't
+        index = NearDuplicateIndex(self.dedupe_threshold)
+        for i, content in enumerate(contents):
+            url = results[i].get("url", "")
+            duplicate = index.check(content, url) if content and self.dedupe_articles else None
+            if duplicate is not None:
+                print(f"🪞 Dropping near-duplicate article {url} (same as {duplicate})")
+                contents[i] = ""
+        return contents
+
+    def _duplicate_hits(self, results) -> set:
+        """Indexes of search hits that repeat an earlier hit's URL or embedded article text"""
+        if not self.dedupe_articles:
+            return set()
+        skip, urls = set(), set()
+        index = NearDuplicateIndex(self.dedupe_threshold)
+        for i, result in enumerate(results):
+            url = result.get("url", "")
+            key = normalize_url(url) if url else None
+            if key and key in urls:
+                skip.add(i)
+                continue
+            if key:
+                urls.add(key)
+            duplicate = index.check(clean_markdown(result.get("markdown") or ""), url)
+            if duplicate is not None:
+                print(f"🪞 Skipping near-duplicate article {url} (same as {duplicate})")
+                skip.add(i)
+        return skip
+
+    def _on_retry(self, action: str, error: Exception, kind: str, attempt: int, delay: float):
+        if kind == "rate_limit":
+            # Close the shared bucket so other workers back off too
+            self.rate_limiter.drain("firecrawl:requests", self.requests_per_minute, delay)
+            print(f"⚠️ Firecrawl rate limit on {action} (attempt {attempt + 1}/{self.retry_policy.max_attempts}), waiting {delay:.1f}s...")
+        else:
+            print(f"⚠️ Firecrawl error on {action} (attempt {attempt + 1}/{self.retry_policy.max_attempts}), retrying in {delay:.1f}s...")
+
+    def cache_stats(self) -> list:
+        """Hit/miss statistics for every active cache"""
+        return [cache.stats() for cache in (self.search_cache, self.scrape_cache) if cache]
+
+    async def _get_cached_search(self, full_query: str, num_results: int):
+        """Serve a search from cache, keyed on the normalized query plus limit"""
+        if not self.search_cache:
+            return None
+        payload = await self.search_cache.aget(content_key(normalize_query(full_query), num_results))
+        if not payload:
+            return None
+        try:
+            return SearchResponse(success=True, data=json.loads(payload))
+        except Exception:
+            return None
+
+    async def _store_cached_search(self, full_query: str, num_results: int, result):
+        if not self.search_cache or not result:
+            return
+        data = result.data if hasattr(result, 'data') else result
+        if data:
+            key = content_key(normalize_query(full_query), num_results)
+            await self.search_cache.aset(key, json.dumps(data, default=str))
+
+    async def _get_cached_page(self, cache_key: str):
+        """Rebuild a ScrapeResponse from the cache so callers still get `.markdown`"""
+        if not self.scrape_cache:
+            return None
+        payload = await self.scrape_cache.aget(cache_key)
+        if not payload:
+            return None
+        try:
+            return ScrapeResponse(**json.loads(payload))
+        except Exception:
+            await self.scrape_cache.adelete(cache_key)
+            return None
 
+    async def _store_cached_page(self, cache_key: str, url: str, result):
+        if not self.scrape_cache or not result or not getattr(result, "markdown", None):
+            return
+        payload = {
+            "url": url,
+            "markdown": result.markdown,
+            "metadata": getattr(result, "metadata", None),
+        }
+        await self.scrape_cache.aset(cache_key, json.dumps(payload, default=str))
@@ -0,0 +1,304 @@
+import os
+import json
+import time
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from .cache import DEFAULT_CACHE_DIR
+from .entities import canonical_url, entity_key, normalize_name
+from .models import CompanyInfo
+from .relevance import terms
+from .validation import get_rulebook
+
+# Facets shared with an entry that make another tool a plausible alternative, by weight
+ALTERNATIVE_WEIGHTS = {"category": 3, "tech": 1, "language": 1}
+# Bonus when one tool lists the other among its competitors
+COMPETITOR_BONUS = 5
+
+
+class KnowledgeEntry(NamedTuple):
+    company: CompanyInfo
+    categories: List[str]
+    content_hash: str
+    prompt_version: str
+    researched_at: float
+
+
+class KnowledgeBase:
+    """Local store of every researched tool, searchable without the network.
+
+    Each tool is keyed by its resolved entity name and keeps its ``CompanyInfo``,
+    official site, the hash of the page it was analyzed from, the analysis prompt
+    version and when it was researched. Categories, tech stack, languages,
+    integrations and competitors are indexed as facets; names, descriptions and
+    facets are also full-text indexed with FTS5.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age_seconds: Optional[int] = None):
+        cache_dir = os.getenv("CACHE_DIR", DEFAULT_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = path or os.getenv("KNOWLEDGE_BASE_PATH") or os.path.join(cache_dir, "knowledge_base.sqlite3")
+        self.max_age_seconds = (
+            int(os.getenv("KNOWLEDGE_BASE_TTL", "2592000")) if max_age_seconds is None else max_age_seconds
+        )
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS tools (
+                       key TEXT PRIMARY KEY,
+                       name TEXT NOT NULL,
+                       site TEXT NOT NULL,
+                       company TEXT NOT NULL,
+                       categories TEXT NOT NULL,
+                       content_hash TEXT NOT NULL,
+                       prompt_version TEXT NOT NULL,
+                       researched_at REAL NOT NULL
+                   )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tools_site ON tools (site)")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS facets (
+                       facet TEXT NOT NULL,
+                       value TEXT NOT NULL,
+                       key TEXT NOT NULL,
+                       PRIMARY KEY (facet, value, key)
+                   ) WITHOUT ROWID"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_facets_key ON facets (key)")
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS tools_fts USING fts5(key UNINDEXED, name, description, facets)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _entry(row) -> KnowledgeEntry:
+        company, categories, content_hash, prompt_version, researched_at = row
+        return KnowledgeEntry(
+            CompanyInfo.model_validate_json(company), json.loads(categories), content_hash, prompt_version,
+            researched_at
+        )
+
+    def get(self, name: str) -> Optional[KnowledgeEntry]:
+        return self.get_many([name])[0]
+
+    def get_many(self, names: Iterable[str]) -> List[Optional[KnowledgeEntry]]:
+        """Entries for several tool names, looked up over one connection"""
+        with self._connect() as conn:
+            rows = [
+                conn.execute(
+                    "SELECT company, categories, content_hash, prompt_version, researched_at FROM tools WHERE key = ?",
+                    (entity_key(name),)
+                ).fetchone()
+                for name in names
+            ]
+        return [self._entry(row) if row else None for row in rows]
+
+    def get_by_site(self, url: str) -> Optional[KnowledgeEntry]:
+        return self.get_many_by_site([url])[0]
+
+    def get_many_by_site(self, urls: Iterable[str]) -> List[Optional[KnowledgeEntry]]:
+        """Most recent entry for each official site URL, looked up over one connection"""
+        with self._connect() as conn:
+            rows = [
+                conn.execute(
+                    """SELECT company, categories, content_hash, prompt_version, researched_at FROM tools
+                       WHERE site = ? ORDER BY researched_at DESC LIMIT 1""",
+                    (site,)
+                ).fetchone() if site else None
+                for site in map(canonical_url, urls)
+            ]
+        return [self._entry(row) if row else None for row in rows]
+
+    def is_fresh(self, entry: Optional[KnowledgeEntry], prompt_version: Optional[str] = None) -> bool:
+        """Young enough, and analyzed with the current prompt when one is given"""
+        if entry is None or time.time() - entry.researched_at > self.max_age_seconds:
+            return False
+        return prompt_version is None or entry.prompt_version == prompt_version
+
+    def upsert(self, company: CompanyInfo, content_hash: str, prompt_version: str):
+        """Store a researched tool, replacing its previous entry and facets.
+
+        Categories come from the tool's own name, description and tech stack, never
+        from the query that surfaced it, so one mis-targeted search can't tag a tool.
+        """
+        key = entity_key(company.name)
+        if not key:
+            return
+        categories = set(get_rulebook().categories(" ".join([company.name, company.description, *company.tech_stack])))
+
+        facets = {("category", normalize_name(category)) for category in categories}
+        facets.update(("tech", normalize_name(value)) for value in company.tech_stack)
+        facets.update(("language", normalize_name(value)) for value in company.language_support)
+        facets.update(("integration", normalize_name(value)) for value in company.integration_capabilities)
+        facets.update(("competitor", entity_key(value)) for value in company.competitors)
+        facets = {(facet, value) for facet, value in facets if value}
+
+        facet_text = " ".join([
+            *sorted(categories), *company.tech_stack, *company.language_support,
+            *company.integration_capabilities, *company.competitors
+        ])
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO tools
+                   (key, name, site, company, categories, content_hash, prompt_version, researched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, company.name, canonical_url(company.website), company.model_dump_json(),
+                 json.dumps(sorted(categories)), content_hash, prompt_version, time.time())
+            )
+            conn.execute("DELETE FROM facets WHERE key = ?", (key,))
+            conn.executemany(
+                "INSERT INTO facets (facet, value, key) VALUES (?, ?, ?)",
+                [(facet, value, key) for facet, value in facets]
+            )
+            conn.execute("DELETE FROM tools_fts WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO tools_fts (key, name, description, facets) VALUES (?, ?, ?, ?)",
+                (key, company.name, company.description, facet_text)
+            )
+
+    def _companies(self, conn, keys: Iterable[str]) -> List[CompanyInfo]:
+        keys = list(keys)
+        if not keys:
+            return []
+        rows = dict(conn.execute(
+            f"SELECT key, company FROM tools WHERE key IN ({', '.join('?' * len(keys))})", keys
+        ).fetchall())
+        return [CompanyInfo.model_validate_json(rows[key]) for key in keys if key in rows]
+
+    def search(self, text: str = "", category: str = "", tech: str = "", language: str = "",
+               limit: int = 10) -> List[CompanyInfo]:
+        """Tools matching every given filter; free text is ranked by FTS5 relevance"""
+        where, params = [], []
+        if category:
+            # "ci/cd" finds the "DevOps & Infrastructure" group as well as a group named outright
+            values = {normalize_name(group) for group in get_rulebook().categories(category)}
+            values.add(normalize_name(category))
+            where.append(
+                f"t.key IN (SELECT key FROM facets WHERE facet = 'category' AND value IN ({', '.join('?' * len(values))}))"
+            )
+            params.extend(sorted(values))
+        for facet, value in (("tech", tech), ("language", language)):
+            if value:
+                where.append("t.key IN (SELECT key FROM facets WHERE facet = ? AND value = ?)")
+                params.extend([facet, normalize_name(value)])
+
+        words = terms(text)
+        if text and not words:
+            return []
+        if words:
+            sql = """SELECT t.key FROM tools t
+                     JOIN (SELECT key, bm25(tools_fts) AS rank FROM tools_fts WHERE tools_fts MATCH ?) f
+                     ON f.key = t.key"""
+            params.insert(0, " OR ".join(f'"{word}"' for word in words))
+            order = "f.rank"
+        else:
+            sql = "SELECT t.key FROM tools t"
+            order = "t.researched_at DESC"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute(sql, params).fetchall()]
+            return self._companies(conn, keys)
+
+    def alternatives(self, name: str, limit: int = 5) -> List[CompanyInfo]:
+        """Tools that could replace `name`: shared category, stack or languages, or listed as competitors.
+
+        A tool that isn't in the knowledge base yet falls back to a full-text search
+        for its name (descriptions and competitor lists that mention it).
+        """
+        key = entity_key(name)
+        with self._connect() as conn:
+            if not conn.execute("SELECT 1 FROM tools WHERE key = ?", (key,)).fetchone():
+                return [company for company in self.search(name, limit=limit + 1) if entity_key(company.name) != key][:limit]
+
+            scores: Dict[str, int] = {}
+            shares_category = set()
+            rows = conn.execute(
+                f"""SELECT other.key, other.facet FROM facets mine
+                    JOIN facets other ON other.facet = mine.facet AND other.value = mine.value
+                    WHERE mine.key = ? AND other.key != ?
+                    AND mine.facet IN ({', '.join('?' * len(ALTERNATIVE_WEIGHTS))})""",
+                (key, key, *ALTERNATIVE_WEIGHTS)
+            ).fetchall()
+            for other, facet in rows:
+                scores[other] = scores.get(other, 0) + ALTERNATIVE_WEIGHTS[facet]
+                if facet == "category":
+                    shares_category.add(other)
+
+            # Competitor links count in both directions
+            competitors = {row[0] for row in conn.execute(
+                """SELECT key FROM facets WHERE facet = 'competitor' AND value = ?
+                   UNION SELECT value FROM facets WHERE facet = 'competitor' AND key = ?""",
+                (key, key)
+            ).fetchall()} - {key}
+            for other in competitors:
+                scores[other] = scores.get(other, 0) + COMPETITOR_BONUS
+
+            has_category = conn.execute(
+                "SELECT 1 FROM facets WHERE key = ? AND facet = 'category' LIMIT 1", (key,)
+            ).fetchone()
+            candidates = [
+                other for other in scores
+                if not has_category or other in shares_category or other in competitors
+            ]
+            ranked = sorted(candidates, key=lambda other: (-scores[other], other))
+            return self._companies(conn, ranked)[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            tools = conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+            stale = conn.execute(
+                "SELECT COUNT(*) FROM tools WHERE researched_at < ?", (time.time() - self.max_age_seconds,)
+            ).fetchone()[0]
+        return {"tools": tools, "stale": stale}
+
+
+_knowledge_base = None
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Process-wide knowledge base backed by the shared SQLite file"""
+    global _knowledge_base
+    if _knowledge_base is None:
+        _knowledge_base = KnowledgeBase()
+    return _knowledge_base
+
+
+if __name__ == "__main__":
+    import argparse
+    from rich.console import Console
+
+    parser = argparse.ArgumentParser(description="Search researched tools offline")
+    parser.add_argument("text", nargs="?", default="", help="free-text search over names, descriptions and facets")
+    parser.add_argument("--category", default="", help='e.g. "ci/cd" or "Databases & Storage"')
+    parser.add_argument("--tech", default="", help="tech stack entry, e.g. Go")
+    parser.add_argument("--language", default="", help="supported language, e.g. Python")
+    parser.add_argument("--alternatives", metavar="TOOL", help="tools that could replace TOOL")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    console = Console()
+    kb = get_knowledge_base()
+    started = time.perf_counter()
+    if args.alternatives:
+        results = kb.alternatives(args.alternatives, limit=args.limit)
+    else:
+        results = kb.search(args.text, category=args.category, tech=args.tech, language=args.language, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    stats = kb.stats()
+    console.print(f"[bold]📚 {len(results)} of {stats['tools']} known tools[/bold] [dim]({elapsed_ms:.1f} ms)[/dim]")
+    for company in results:
+        details = ", ".join(filter(None, [company.pricing_model, ", ".join(company.tech_stack[:3])]))
+        console.print(f"  [cyan]{company.name}[/cyan] [dim]{company.website}[/dim] {details}")
@@ -0,0 +1,77 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton mapping substrings to labels.
+
+    Built once from ``{label: patterns}``; ``labels(text)`` then reports every label
+    with at least one pattern occurring anywhere in ``text`` - the same answer as
+    ``any(p in text for p in patterns)`` per label - in a single pass over the text.
+    ``matches(text)`` also says which patterns matched.
+    """
+
+    def __init__(self, patterns_by_label: Dict[str, Iterable[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        outputs: List[Set[Tuple[str, str]]] = [set()]
+        for label, patterns in patterns_by_label.items():
+            for pattern in patterns:
+                if not pattern:
+                    continue
+                state = 0
+                for char in pattern:
+                    next_state = self.goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self.goto)
+                        self.goto[state][char] = next_state
+                        self.goto.append({})
+                        self.fail.append(0)
+                        outputs.append(set())
+                    state = next_state
+                outputs[state].add((label, pattern))
+
+        # Breadth-first failure links; each state inherits the labels of its fallback
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                outputs[next_state] |= outputs[self.fail[next_state]]
+        self.output = [frozenset(label for label, _ in pairs) for pairs in outputs]
+        self.output_patterns = [tuple(sorted(pairs)) for pairs in outputs]
+
+    def labels(self, text: str) -> Set[str]:
+        """Every label with a pattern occurring in `text`"""
+        found: Set[str] = set()
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+    def labels_many(self, texts: Iterable[str]) -> List[Set[str]]:
+        return [self.labels(text) for text in texts]
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """Matched patterns per label, in order of first occurrence in `text`"""
+        found: Dict[str, List[str]] = {}
+        state = 0
+        goto, fail, output_patterns = self.goto, self.fail, self.output_patterns
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for label, pattern in output_patterns[state]:
+                patterns = found.setdefault(label, [])
+                if pattern not in patterns:
+                    patterns.append(pattern)
+        return found
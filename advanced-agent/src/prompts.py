@@ -1,3 +1,5 @@
+import hashlib
+
 
 class DeveloperToolsPrompts:
     """Collection of prompts for analyzing developer tools and technologies"""
@@ -76,7 +78,7 @@ class DeveloperToolsPrompts:
     @staticmethod
     def tool_analysis_user(company_name: str, content: str) -> str:
         return f"""Company/Tool: {company_name}
-                Website Content: {content[:2500]}
+                Website Content: {content}
 
                 Analyze this content from a developer's perspective and provide:
 
@@ -104,6 +106,44 @@ class DeveloperToolsPrompts:
 
                 Focus on both technical capabilities and business/market positioning."""
 
+    @staticmethod
+    def tool_analysis_batch_user(tools) -> str:
+        sections = "\n\n".join(
+            f"### Tool {i}: {name}\nWebsite Content: {content}"
+            for i, (name, content) in enumerate(tools, 1)
+        )
+        return f"""Analyze each of the following {len(tools)} developer tools from a developer's perspective.
+
+                {sections}
+
+                For EACH tool provide:
+                - name: the tool name exactly as given above
+                - pricing_model: One of "Free", "Freemium", "Paid", "Enterprise", or "Unknown"
+                - is_open_source: true if open source, false if proprietary, null if unclear
+                - tech_stack: List of programming languages, frameworks, databases, APIs, or technologies supported/used
+                - description: Brief 1-sentence description focusing on what this tool does for developers
+                - api_available: true if REST API, GraphQL, SDK, or programmatic access is mentioned
+                - language_support: List of programming languages explicitly supported
+                - integration_capabilities: List of tools/platforms it integrates with
+                - market_position: One of "Leader", "Challenger", "Niche", "Emerging" (default: "Niche")
+                - company_size: One of "Startup", "SMB", "Enterprise", "Public" (default: "SMB")
+                - funding_status: One of "Bootstrapped", "Seed", "Series A", "Series B", "Series C", "IPO", "Acquired" (default: "Bootstrapped")
+                - user_base_size: One of "<1K", "1K-10K", "10K-100K", "100K+", "1M+" (default: "10K-100K")
+                - github_stars: Number if a GitHub repository is mentioned, otherwise null
+                - market_trends: List of relevant market trends or growth indicators (default: [])
+
+                CRITICAL OUTPUT FORMAT:
+                - Return ONLY a JSON array with exactly one object per tool, in the order given
+                - Analyze each tool only from its own website content
+                - NO text before or after the JSON array"""
+
+    @classmethod
+    def tool_analysis_version(cls) -> str:
+        """Fingerprint of the tool analysis prompts; changes whenever any of them is edited"""
+        template = cls.tool_analysis_user("{company_name}", "{content}")
+        template += cls.tool_analysis_batch_user([("{company_name}", "{content}")])
+        return hashlib.sha256((cls.TOOL_ANALYSIS_SYSTEM + template).encode("utf-8")).hexdigest()[:16]
+
     # Recommendation prompts
     RECOMMENDATIONS_SYSTEM = """You are a senior software engineer and market analyst providing comprehensive tech recommendations.
                             Include both technical analysis and market intelligence insights."""
@@ -148,7 +188,7 @@ class DeveloperToolsPrompts:
     def detailed_analysis_user(tool_name: str, content: str, query_context: str) -> str:
         return f"""Tool: {tool_name}
                 Context: {query_context}
-                Website/Documentation Content: {content[:4000]}
+                Website/Documentation Content: {content}
 
                 Provide a comprehensive analysis using EXACTLY this structure:
 
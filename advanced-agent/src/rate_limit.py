@@ -0,0 +1,126 @@
+import os
+import time
+import asyncio
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional
+from .cache import DEFAULT_CACHE_DIR
+
+
+# Groq free-tier limits per model: (requests per minute, tokens per minute).
+# GROQ_RPM / GROQ_TPM override these for every model (e.g. on the Dev Tier).
+GROQ_MODEL_LIMITS = {
+    "llama-3.1-8b-instant": (30, 6000),
+    "llama-3.1-70b-versatile": (30, 6000),
+    "llama-3.3-70b-versatile": (30, 12000),
+    "mixtral-8x7b-32768": (30, 5000),
+    "gemma2-9b-it": (30, 15000),
+}
+DEFAULT_GROQ_LIMITS = (30, 6000)
+
+
+def groq_limits(model: str):
+    """Requests/min and tokens/min budget for a Groq model"""
+    rpm, tpm = GROQ_MODEL_LIMITS.get(model, DEFAULT_GROQ_LIMITS)
+    return float(os.getenv("GROQ_RPM", rpm)), float(os.getenv("GROQ_TPM", tpm))
+
+
+class RateLimiter:
+    """Client-side token buckets shared across threads and processes.
+
+    Bucket state lives in a small SQLite file and every acquire runs inside an
+    IMMEDIATE transaction, so concurrent workers on the same machine draw from
+    one budget instead of each assuming it has the whole quota.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        cache_dir = os.getenv("CACHE_DIR", DEFAULT_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = path or os.path.join(cache_dir, "ratelimits.sqlite3")
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS buckets (
+                       name TEXT PRIMARY KEY,
+                       tokens REAL NOT NULL,
+                       updated_at REAL NOT NULL
+                   )"""
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def try_acquire(self, name: str, per_minute: float, amount: float = 1) -> float:
+        """Take `amount` from a bucket refilling at `per_minute`.
+
+        Returns 0 when granted, otherwise the seconds to wait before retrying.
+        Requests larger than the bucket are clamped so they can still proceed.
+        """
+        if per_minute <= 0:
+            return 0.0
+        capacity = float(per_minute)
+        amount = min(float(amount), capacity)
+        rate = capacity / 60.0
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+
+                if tokens >= amount:
+                    tokens -= amount
+                    wait = 0.0
+                else:
+                    wait = (amount - tokens) / rate
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (name, tokens, now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def drain(self, name: str, per_minute: float, retry_after: Optional[float] = None):
+        """Empty a bucket after the server reports a 429, so every worker backs off"""
+        if per_minute <= 0:
+            return
+        rate = per_minute / 60.0
+        # A negative balance keeps the bucket closed for `retry_after` seconds
+        tokens = -(retry_after or 0) * rate
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (name, tokens, time.time())
+            )
+
+    async def acquire(self, name: str, per_minute: float, amount: float = 1):
+        """Wait until the bucket grants `amount`.
+
+        The SQLite transaction runs in a worker thread: under contention it can hold
+        for up to the 30s lock timeout, and that must not freeze other tasks.
+        """
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, name, per_minute, amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, 5.0))
+
+
+_shared_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter instance backed by the shared bucket file"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter()
+    return _shared_limiter
@@ -0,0 +1,132 @@
+import re
+import math
+from collections import Counter
+from typing import List
+from .tokens import estimate_tokens, fit_text
+
+HEADER_LINE = re.compile(r"^\s{0,3}#{1,6}\s")
+TERM = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "that", "the", "this", "to", "with", "you", "your", "we", "our", "can", "will",
+}
+
+# Okapi BM25 parameters
+K1 = 1.5
+B = 0.75
+DEFAULT_CHUNK_TOKENS = 180
+
+
+def terms(text: str) -> List[str]:
+    return [term for term in TERM.findall(text.lower()) if term not in STOPWORDS]
+
+
+def _pieces(text: str, max_tokens: int) -> List[str]:
+    """Break an oversized paragraph into lines, then sentences, then runs of words"""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    for separator in (r"\n", r"(?<=[.!?])\s+"):
+        parts = [part.strip() for part in re.split(separator, text) if part.strip()]
+        if len(parts) > 1:
+            return [piece for part in parts for piece in _pieces(part, max_tokens)]
+    words = text.split()
+    step = max(1, max_tokens * 3 // 4)
+    return [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+
+
+def split_chunks(markdown: str, max_chunk_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[str]:
+    """Split markdown into header-delimited sections, then long sections into paragraph groups.
+
+    Pieces of a split section repeat its header so each chunk stays self-describing.
+    """
+    sections, current = [], []
+    for line in markdown.splitlines():
+        if HEADER_LINE.match(line) and current:
+            sections.append(current)
+            current = []
+        current.append(line)
+    if current:
+        sections.append(current)
+
+    chunks = []
+    for lines in sections:
+        text = "\n".join(lines).strip()
+        if not text:
+            continue
+        if estimate_tokens(text) <= max_chunk_tokens:
+            chunks.append(text)
+            continue
+
+        header = lines[0].strip() if HEADER_LINE.match(lines[0]) else ""
+        body = "\n".join(lines[1:] if header else lines)
+        piece, used = [], 0
+        paragraphs = [paragraph.strip() for paragraph in re.split(r"\n\s*\n", body) if paragraph.strip()]
+        for paragraph in (part for paragraph in paragraphs for part in _pieces(paragraph, max_chunk_tokens)):
+            cost = estimate_tokens(paragraph)
+            if piece and used + cost > max_chunk_tokens:
+                chunks.append("\n\n".join(([header] if header else []) + piece))
+                piece, used = [], 0
+            piece.append(paragraph)
+            used += cost
+        if piece:
+            chunks.append("\n\n".join(([header] if header else []) + piece))
+    return chunks
+
+
+def bm25_scores(chunks: List[str], query: str) -> List[float]:
+    """BM25 score of every chunk against the query terms"""
+    query_terms = set(terms(query))
+    documents = [Counter(terms(chunk)) for chunk in chunks]
+    if not query_terms or not documents:
+        return [0.0] * len(chunks)
+
+    lengths = [sum(document.values()) for document in documents]
+    average_length = (sum(lengths) / len(lengths)) or 1
+    total = len(documents)
+    idf = {}
+    for term in query_terms:
+        df = sum(1 for document in documents if term in document)
+        idf[term] = math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for document, length in zip(documents, lengths):
+        score = 0.0
+        for term in query_terms:
+            frequency = document.get(term, 0)
+            if not frequency:
+                continue
+            score += idf[term] * frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average_length))
+        scores.append(score)
+    return scores
+
+
+def select_relevant(markdown: str, query: str, max_tokens: int,
+                    max_chunk_tokens: int = DEFAULT_CHUNK_TOKENS) -> str:
+    """Keep the chunks of `markdown` most relevant to `query` within `max_tokens`.
+
+    Selected chunks are returned in document order. Content that already fits is
+    returned unchanged, and with no lexical match at all this falls back to the
+    leading lines, which is what a plain cut-off would have kept.
+    """
+    if not markdown or estimate_tokens(markdown) <= max_tokens:
+        return markdown or ""
+
+    chunks = split_chunks(markdown, max_chunk_tokens)
+    scores = bm25_scores(chunks, query)
+    if not any(scores):
+        return fit_text(markdown, max_tokens)
+
+    ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+    selected, used = [], 0
+    for i in ranked:
+        if scores[i] <= 0:
+            break
+        cost = estimate_tokens(chunks[i]) + 2
+        if used + cost > max_tokens:
+            continue
+        selected.append(i)
+        used += cost
+
+    if not selected:
+        return fit_text(chunks[ranked[0]], max_tokens)
+    return "\n\n".join(chunks[i] for i in sorted(selected))
@@ -0,0 +1,185 @@
+import re
+import time
+import random
+import asyncio
+from typing import Optional
+
+# HTTP statuses worth retrying; everything else (402, 403, 404, ...) won't fix itself
+RETRYABLE_STATUSES = {408, 425, 500, 502, 503, 504}
+RATE_LIMIT_STATUSES = {429}
+
+STATUS_PATTERNS = [
+    re.compile(r"status code:?\s*(\d{3})", re.IGNORECASE),
+    re.compile(r"\b(\d{3})\s+(?:client|server) error", re.IGNORECASE),
+]
+MESSAGE_STATUSES = {
+    "payment required": 402,
+    "website not supported": 403,
+    "request timeout": 408,
+    "internal server error": 500,
+    "bad gateway": 502,
+    "service unavailable": 503,
+    "gateway timeout": 504,
+    "too many requests": 429,
+    "rate limit": 429,
+}
+RETRY_AFTER_PATTERN = re.compile(r"(?:retry[- ]after|try again in)\D{0,3}(\d+(?:\.\d+)?)\s*(ms|s|m)?", re.IGNORECASE)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """Best-effort HTTP status for an exception raised by an HTTP client"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    if isinstance(status, int):
+        return status
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+
+    message = str(error)
+    for pattern in STATUS_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return int(match.group(1))
+    lowered = message.lower()
+    for phrase, code in MESSAGE_STATUSES.items():
+        if phrase in lowered:
+            return code
+    return None
+
+
+def classify_error(error: Exception) -> str:
+    """Classify an error as "rate_limit", "transient" (retry) or "fatal" (give up now)"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return "transient"
+    status = error_status(error)
+    if status in RATE_LIMIT_STATUSES:
+        return "rate_limit"
+    if status in RETRYABLE_STATUSES:
+        return "transient"
+    if status is None:
+        lowered = str(error).lower()
+        if "timeout" in lowered or "timed out" in lowered or "connection" in lowered:
+            return "transient"
+    return "fatal"
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read Retry-After from the response headers or the error message"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+    match = RETRY_AFTER_PATTERN.search(str(error))
+    if match:
+        seconds = float(match.group(1))
+        unit = (match.group(2) or "s").lower()
+        return seconds / 1000 if unit == "ms" else seconds * 60 if unit == "m" else seconds
+    return None
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive transient failures the circuit opens and
+    calls fail fast for `reset_timeout` seconds. Then a single probe call is let
+    through (half-open); success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probe_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+
+    def release(self):
+        """Give up a half-open probe slot without judging the endpoint"""
+        self.probe_in_flight = False
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honoring Retry-After"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    async def run(self, call, breaker: Optional[CircuitBreaker] = None, on_retry=None):
+        """Await `call()` until it succeeds, fails fatally or runs out of attempts.
+
+        `on_retry(error, kind, attempt, delay)` is invoked before each sleep.
+        """
+        for attempt in range(self.max_attempts):
+            if breaker and not breaker.allow():
+                raise CircuitOpenError(f"{breaker.name} circuit is open")
+
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                if breaker:
+                    breaker.release()
+                raise
+            except Exception as e:
+                kind = classify_error(e)
+                if breaker:
+                    if kind == "transient":
+                        breaker.record_failure()
+                    else:
+                        breaker.release()
+                if kind == "fatal" or attempt == self.max_attempts - 1:
+                    raise
+                delay = self.backoff(attempt, retry_after_seconds(e))
+                if on_retry:
+                    on_retry(e, kind, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if breaker:
+                breaker.record_success()
+            return result
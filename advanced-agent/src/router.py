@@ -0,0 +1,247 @@
+import os
+import re
+import json
+import time
+import atexit
+from collections import deque
+from typing import Dict, List, Optional
+from .cache import DEFAULT_CACHE_DIR, cache_enabled
+from .retry import classify_error, error_status, retry_after_seconds
+
+# Prior latency guess (seconds) per position in the preference list, used until a
+# model has real samples: earlier models are assumed faster
+PRIOR_LATENCY_STEP = 1.5
+DEFAULT_RATE_LIMIT_COOLDOWN = 60.0
+# Models that time out or return 5xx / over-capacity errors sit out briefly, then get another try
+DEFAULT_TRANSIENT_COOLDOWN = 10.0
+# Decommissioned models are re-probed occasionally in case the name comes back
+DISABLED_RECHECK_SECONDS = 7 * 24 * 3600
+# Percentiles over fewer samples than this are too noisy to act on
+MIN_PERCENTILE_SAMPLES = 5
+# Latency samples are written to disk at most this often; health changes are written at once
+DEFAULT_SAVE_INTERVAL = 30.0
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DECOMMISSIONED_MARKERS = ("model_decommissioned", "decommissioned", "model_not_found", "does not exist")
+OVERLOADED_MARKERS = ("over capacity", "over_capacity", "overloaded")
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse Groq reset headers such as "2m59.56s", "7.66s" or "120ms" into seconds"""
+    if not value:
+        return None
+    parts = DURATION_PART.findall(str(value))
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def rate_limit_reset_seconds(error: Exception) -> Optional[float]:
+    """Seconds until a rate limit resets, from Retry-After / x-ratelimit-reset-* or the message"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    resets = [
+        parse_duration(headers.get(name))
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if headers.get(name)
+    ]
+    retry_after = retry_after_seconds(error)
+    candidates = [value for value in resets + [retry_after] if value is not None]
+    return max(candidates) if candidates else None
+
+
+def classify_llm_error(error: Exception) -> str:
+    """"rate_limit", "unavailable" (model gone), "transient" (5xx, timeout, connection)
+    or "fatal" (auth, bad request: not the model's fault)"""
+    message = str(error).lower()
+    status = error_status(error)
+    if status == 429 or "rate_limit" in message or "rate limit" in message or "quota" in message:
+        return "rate_limit"
+    if status == 404 or any(marker in message for marker in DECOMMISSIONED_MARKERS):
+        return "unavailable"
+    if any(marker in message for marker in OVERLOADED_MARKERS) or classify_error(error) == "transient":
+        return "transient"
+    return "fatal"
+
+
+def percentile(samples, pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ModelRouter:
+    """Latency- and health-aware model selection.
+
+    Tracks rolling latency per model and per operation, cools rate-limited models
+    down until their reported reset time instead of abandoning them, disables
+    decommissioned models, and persists all of it so the next run starts informed.
+    """
+
+    def __init__(self, models: List[str], state_path: Optional[str] = None, window: int = 50,
+                 persist: Optional[bool] = None, save_interval: Optional[float] = None):
+        self.models = list(models)
+        self.window = window
+        cache_dir = os.getenv("CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.state_path = state_path or os.path.join(cache_dir, "model_router.json")
+        # Router state is cached data like any other; CACHE_ENABLED=false keeps it in memory
+        self.persist = cache_enabled() if persist is None else persist
+        self.save_interval = (
+            float(os.getenv("ROUTER_SAVE_INTERVAL", DEFAULT_SAVE_INTERVAL)) if save_interval is None else save_interval
+        )
+        self.state: Dict[str, dict] = {model: self._empty_state() for model in self.models}
+        self.operation_latency: Dict[str, deque] = {}
+        self._dirty = False
+        self._saved_at = None
+        if self.persist:
+            self._load()
+            # Latency samples gathered since the last throttled write aren't lost on exit
+            atexit.register(self.flush)
+
+    def _empty_state(self) -> dict:
+        return {"latencies": deque(maxlen=self.window), "cooldown_until": 0.0, "disabled_at": None, "disabled_reason": ""}
+
+    def _load(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for model, entry in saved.get("models", {}).items():
+            if model not in self.state:
+                continue
+            state = self.state[model]
+            state["latencies"].extend(entry.get("latencies", []))
+            state["cooldown_until"] = entry.get("cooldown_until", 0.0)
+            state["disabled_at"] = entry.get("disabled_at")
+            state["disabled_reason"] = entry.get("disabled_reason", "")
+        for key, samples in saved.get("operations", {}).items():
+            self.operation_latency[key] = deque(samples, maxlen=self.window)
+
+    def save(self, force: bool = True):
+        """Write state to disk; unforced writes happen at most once per `save_interval`"""
+        if not self.persist:
+            return
+        self._dirty = True
+        now = time.monotonic()
+        if not force and self._saved_at is not None and now - self._saved_at < self.save_interval:
+            return
+        self._saved_at = now
+        self._dirty = False
+        payload = {
+            "models": {
+                model: {
+                    "latencies": list(state["latencies"]),
+                    "cooldown_until": state["cooldown_until"],
+                    "disabled_at": state["disabled_at"],
+                    "disabled_reason": state["disabled_reason"],
+                }
+                for model, state in self.state.items()
+            },
+            "operations": {key: list(samples) for key, samples in self.operation_latency.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+
+    def flush(self):
+        """Write any state held back by throttling"""
+        if self._dirty:
+            self.save()
+
+    def is_available(self, model: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        state = self.state[model]
+        if state["disabled_at"] and now - state["disabled_at"] < DISABLED_RECHECK_SECONDS:
+            return False
+        return state["cooldown_until"] <= now
+
+    def expected_latency(self, model: str, operation: Optional[str] = None) -> float:
+        """Rolling p50 for this model on this operation, falling back to model-wide then the prior"""
+        samples = self.operation_latency.get(f"{model}|{operation}") if operation else None
+        if not samples:
+            samples = self.state[model]["latencies"]
+        if samples:
+            return percentile(samples, 50)
+        return PRIOR_LATENCY_STEP * (self.models.index(model) + 1)
+
+    def latency_percentile(self, model: str, pct: float, operation: Optional[str] = None,
+                           min_samples: int = 1) -> Optional[float]:
+        """Recent latency percentile, per operation when it has enough samples"""
+        samples = self.operation_latency.get(f"{model}|{operation}") if operation else None
+        if not samples or len(samples) < min_samples:
+            samples = self.state[model]["latencies"]
+        if len(samples) < min_samples:
+            return None
+        return percentile(samples, pct)
+
+    def choose(self, operation: Optional[str] = None, exclude=()) -> Optional[str]:
+        """Fastest healthy model for this operation; ties go to the preference order"""
+        now = time.time()
+        candidates = [model for model in self.models if model not in exclude and self.is_available(model, now)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda model: (self.expected_latency(model, operation), self.models.index(model)))
+
+    def next_available_in(self, exclude=()) -> Optional[float]:
+        """Seconds until the soonest cooled-down model becomes usable again"""
+        now = time.time()
+        waits = [
+            max(0.0, self.state[model]["cooldown_until"] - now)
+            for model in self.models
+            if model not in exclude and not self.state[model]["disabled_at"]
+        ]
+        return min(waits) if waits else None
+
+    def record_success(self, model: str, latency: float, operation: Optional[str] = None):
+        state = self.state[model]
+        state["latencies"].append(round(latency, 3))
+        state["disabled_at"] = None
+        state["disabled_reason"] = ""
+        if operation:
+            key = f"{model}|{operation}"
+            self.operation_latency.setdefault(key, deque(maxlen=self.window)).append(round(latency, 3))
+        self.save(force=False)
+
+    def record_error(self, model: str, error: Exception) -> str:
+        """Update model health from a failed call and return the error class"""
+        kind = classify_llm_error(error)
+        state = self.state[model]
+        if kind == "rate_limit":
+            reset = rate_limit_reset_seconds(error)
+            state["cooldown_until"] = time.time() + (reset if reset is not None else DEFAULT_RATE_LIMIT_COOLDOWN)
+        elif kind == "transient":
+            retry_after = retry_after_seconds(error)
+            state["cooldown_until"] = time.time() + (
+                retry_after if retry_after is not None else DEFAULT_TRANSIENT_COOLDOWN
+            )
+        elif kind == "unavailable":
+            state["disabled_at"] = time.time()
+            state["disabled_reason"] = str(error)[:200]
+        if kind != "fatal":
+            self.save()
+        return kind
+
+    def stats(self) -> List[dict]:
+        now = time.time()
+        return [
+            {
+                "model": model,
+                "available": self.is_available(model, now),
+                "p50": self.latency_percentile(model, 50),
+                "p95": self.latency_percentile(model, 95),
+                "cooldown_seconds": max(0.0, state["cooldown_until"] - now),
+                "disabled_reason": state["disabled_reason"],
+            }
+            for model, state in self.state.items()
+        ]
@@ -0,0 +1,138 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Header spellings accepted for each DetailedAnalysis section, keyed by the header the
+# prompt asks for. Keys are compared after header_key() normalization.
+DETAILED_ANALYSIS_SECTIONS = {
+    "overview": ["overview", "summary", "introduction", "tool overview"],
+    "advantages": ["advantages", "pros", "strengths", "benefits", "key strengths"],
+    "disadvantages": ["disadvantages", "cons", "limitations", "weaknesses", "drawbacks"],
+    "technical deep dive": ["technical deep dive", "technical details", "technical overview", "technical analysis",
+                            "architecture"],
+    "best for": ["best for", "ideal for", "use cases best for", "best use cases", "when to use"],
+    "not ideal for": ["not ideal for", "not recommended for", "when not to use", "avoid if", "not suitable for"],
+    "developer experience": ["developer experience", "dx", "developer experience dx"],
+    "pricing and value": ["pricing and value", "pricing", "pricing analysis", "cost and value", "value"],
+    "alternatives comparison": ["alternatives comparison", "alternatives", "comparison with alternatives",
+                                "competitors", "competitive comparison"],
+}
+
+# Plain lines ("Advantages:") only count as headers when this short, ending in a colon, a
+# known section name and not inside an ATX section, so body lines like "Value" or
+# "Summary:" don't start a section
+MAX_PLAIN_HEADER_LENGTH = 40
+
+_BOLD_LINE = re.compile(r"^(\*\*|__)(.+?)\1\s*:?\s*$")
+_NUMBERING = re.compile(r"^(\d+[.)]|[ivx]+\.)\s+")
+_LIST_MARKER = re.compile(r"^([-*•+]|\d+[.)])\s+")
+_SCORE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (r'(\d+)/10', r'score[:\s]*(\d+)', r'rating[:\s]*(\d+)', r'recommend[:\s]*(\d+)')
+]
+
+
+def header_key(title: str) -> str:
+    """Normalized header text: '### 2. Pros & Cons:' -> 'pros and cons'"""
+    title = title.strip().strip("#*_ ").strip()
+    title = _NUMBERING.sub("", title.lower())
+    title = title.replace("&", " and ")
+    return " ".join(re.findall(r"[a-z0-9]+", title))
+
+
+class SectionIndex:
+    """Markdown split into sections in one pass over the text.
+
+    ATX headers (``#`` to ``######``), whole-line bold headers (``**Pros:**``) and
+    short plain lines naming a known section with a colon (``Advantages:``) all start a section;
+    each section runs to the next header of any level. A response that opens sections
+    with ATX headers uses them throughout, so inside an ATX section plain lines are body
+    text. ``aliases`` maps a section
+    name to the header spellings that count as it; the first non-empty occurrence
+    of each section wins.
+    """
+
+    def __init__(self, text: str, aliases: Optional[Dict[str, Iterable[str]]] = None):
+        self.text = text or ""
+        self.lookup: Dict[str, str] = {}
+        for name, spellings in (aliases or {}).items():
+            for spelling in [name, *spellings]:
+                self.lookup.setdefault(header_key(spelling), header_key(name))
+        # Longest first, so "not ideal for" wins over "ideal for" as a suffix match
+        self._suffixes = sorted(self.lookup, key=len, reverse=True)
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self._index()
+
+    def _resolve(self, key: str, loose: bool) -> str:
+        if key in self.lookup:
+            return self.lookup[key]
+        if loose:
+            # "Jenkins Overview", "Advantages (Pros)"
+            unbracketed = header_key(re.sub(r"\(.*?\)", " ", key))
+            if unbracketed in self.lookup:
+                return self.lookup[unbracketed]
+            for suffix in self._suffixes:
+                if key.endswith(" " + suffix):
+                    return self.lookup[suffix]
+        return key
+
+    def _header(self, line: str, plain: bool = True) -> Optional[str]:
+        """Section name if the (stripped) line is a header, else None; `plain` allows plain-line headers"""
+        if not line:
+            return None
+        if line[0] == "#":
+            return self._resolve(header_key(line), loose=True)
+        if line[0] in "*_":
+            bold = _BOLD_LINE.match(line)
+            return self._resolve(header_key(bold.group(2)), loose=True) if bold else None
+        if plain and len(line) <= MAX_PLAIN_HEADER_LENGTH and line[0].isalnum() and line.endswith(":"):
+            key = header_key(line[:-1])
+            if key in self.lookup:
+                return self.lookup[key]
+        return None
+
+    def _index(self):
+        current, start, offset = None, 0, 0
+        in_atx = False
+        for line in self.text.splitlines(keepends=True):
+            stripped = line.strip()
+            name = self._header(stripped, plain=not in_atx)
+            if name is not None:
+                self._close(current, start, offset)
+                current, start = name, offset + len(line)
+                in_atx = stripped.startswith("#")
+            offset += len(line)
+        self._close(current, start, offset)
+
+    def _close(self, name: Optional[str], start: int, end: int):
+        if name is None:
+            return
+        if name not in self.spans or not self.get(name):
+            self.spans[name] = (start, end)
+
+    def get(self, name: str) -> str:
+        """Body text of a section ('' when absent)"""
+        span = self.spans.get(self._resolve(header_key(name), loose=False))
+        return self.text[span[0]:span[1]].strip() if span else ""
+
+    def items(self, name: str) -> List[str]:
+        """List entries of a section; non-list lines count as entries too"""
+        items = []
+        for line in self.get(name).splitlines():
+            line = line.strip()
+            if not line or line.startswith("#") or line.startswith("**"):
+                continue
+            items.append(_LIST_MARKER.sub("", line, count=1).strip())
+        return [item for item in items if item]
+
+
+def extract_score(text: str) -> Optional[int]:
+    """First 1-10 recommendation score found, trying '/10' before 'score', 'rating' and 'recommend'"""
+    if not text:
+        return None
+    for pattern in _SCORE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            score = int(match.group(1))
+            if 1 <= score <= 10:
+                return score
+    return None
@@ -0,0 +1,61 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesce concurrent identical async calls into one.
+
+    The first caller for a key runs fetch(); callers arriving while it is in
+    flight await the same result instead of issuing a duplicate request. Nothing
+    is kept once the call finishes; caching across calls is the caller's job.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._futures = {}
+
+    async def do(self, key, fetch):
+        loop = asyncio.get_running_loop()
+        while True:
+            future = self._futures.get(key)
+            if future is None:
+                break
+            if not future.done() and future.get_loop() is not loop:
+                # In flight on another event loop (e.g. a sync wrapper in another thread);
+                # it can't be awaited from here, so run our own call without registering it
+                self.calls += 1
+                return await fetch()
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The owning caller was cancelled (e.g. hit its own deadline); take over
+                continue
+            self.coalesced += 1
+            return result
+
+        self.calls += 1
+        future = loop.create_future()
+        self._futures[key] = future
+        try:
+            result = await fetch()
+        except BaseException as e:
+            self._futures.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved when nobody else was waiting
+                future.exception()
+            raise
+
+        self._futures.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def forget(self, key):
+        self._futures.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,67 @@
+import re
+from .rate_limit import groq_limits
+
+# Rough local token estimate for Llama/Mixtral-style BPE tokenizers:
+# English prose averages ~4 characters per token, code and URLs run denser.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a string without calling a tokenizer"""
+    if not text:
+        return 0
+    words = len(re.findall(r"\S+", text))
+    return max(words, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages) -> int:
+    """Estimate prompt tokens for a list of chat messages, including per-message overhead"""
+    total = 0
+    for message in messages:
+        content = getattr(message, "content", message)
+        total += estimate_tokens(content if isinstance(content, str) else str(content)) + 4
+    return total
+
+
+# Context windows (tokens) of the Groq models the workflow can route to
+MODEL_CONTEXT_WINDOWS = {
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.1-70b-versatile": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "mixtral-8x7b-32768": 32768,
+    "gemma2-9b-it": 8192,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+# Headroom for the gap between the local estimate and the real tokenizer
+ESTIMATE_SAFETY_MARGIN = 0.9
+
+
+def context_window(model: str) -> int:
+    return MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+
+def prompt_token_limit(model: str, reserved_output_tokens: int = 0) -> int:
+    """Largest prompt (estimated tokens) one request to `model` can carry.
+
+    Groq rejects a request larger than the model's tokens-per-minute limit outright,
+    so on the free tier that, not the context window, is usually the binding limit.
+    """
+    _, tpm = groq_limits(model)
+    return max(0, int(min(context_window(model), tpm) * ESTIMATE_SAFETY_MARGIN) - reserved_output_tokens)
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """Longest run of whole lines from the start of `text` that fits in `max_tokens`"""
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text or ""
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            if not kept:
+                # A single oversized first line: cut it rather than return nothing
+                kept.append(line[:max(0, max_tokens) * CHARS_PER_TOKEN])
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+_session_loop = None
+_session_lock = threading.Lock()
+
+
+def get_session_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop, started on a daemon thread on first use.
+
+    Async clients (ChatGroq, AsyncFirecrawlApp and their httpx pools) are cached on
+    the Workflow and bind to the loop they first run on, so every query and every
+    sync helper call runs on this one loop rather than on a fresh one each time.
+    """
+    global _session_loop
+    with _session_lock:
+        if _session_loop is None or _session_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="session-loop", daemon=True).start()
+            _session_loop = loop
+    return _session_loop
+
+
+def run_sync(coro):
+    """Run a coroutine to completion on the session loop from synchronous code.
+
+    Also works when called from inside another running event loop (e.g. a notebook
+    or async web handler): that loop blocks until the result is ready. Calling it
+    from a coroutine already on the session loop would deadlock, so that raises.
+    """
+    loop = get_session_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the session loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -0,0 +1,233 @@
+import os
+import re
+import json
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from .cache import DiskCache
+from .matcher import PatternMatcher
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "data", "tool_rules.json")
+
+# Rule classes compiled into one automaton and scanned against the lowercased name.
+# "strong" is matched separately, against the name with spaces removed.
+RULE_CLASSES = ("exclude", "hard_exclude", "dev_context", "known", "category", "technical", "ambiguous", "coding")
+
+
+class ToolVerdict(NamedTuple):
+    name: str
+    verdict: str  # "validated", "excluded", "uncertain" or "skipped" (blank / too short)
+    matched: FrozenSet[str]
+    trace: Tuple[str, ...]  # which rules fired, e.g. ("exclude:shop", "no dev context")
+    rules_version: int
+
+
+def _patterns(value) -> List[str]:
+    """Rule entries are a flat list or a {group: [patterns]} mapping"""
+    if isinstance(value, dict):
+        return [pattern.lower() for patterns in value.values() for pattern in patterns]
+    return [pattern.lower() for pattern in value or []]
+
+
+class Rulebook:
+    """Developer-tool classification rules loaded from a versioned JSON file.
+
+    The patterns are compiled into Aho-Corasick matchers once per load. Edits to the
+    file are picked up by ``reload_if_changed`` (an mtime check) without a restart;
+    a file that fails to load leaves the previous rules in place.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("TOOL_RULES_PATH", DEFAULT_RULES_PATH)
+        self.mtime = None
+        self._load()
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        matcher = PatternMatcher({rule: _patterns(data.get(rule)) for rule in RULE_CLASSES})
+        strong_matcher = PatternMatcher({"strong": _patterns(data.get("strong"))})
+        categories = data.get("category")
+        category_matcher = PatternMatcher(
+            {group: _patterns(patterns) for group, patterns in categories.items()}
+            if isinstance(categories, dict) else {"Developer Tools": _patterns(categories)}
+        )
+        min_technical_keep = int(data.get("min_technical_keep", 3))
+
+        self.version = int(data.get("version", 0))
+        self.matcher = matcher
+        self.strong_matcher = strong_matcher
+        self.category_matcher = category_matcher
+        self.min_technical_keep = min_technical_keep
+        self.mtime = mtime
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self.mtime:
+            return False
+        try:
+            self._load()
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            # Don't retry a broken file on every call; wait for the next edit
+            self.mtime = mtime
+            print(f"⚠️ Tool rules in {self.path} failed to load, keeping v{self.version}: {e}")
+            return False
+        print(f"🔄 Reloaded tool rules v{self.version} from {self.path}")
+        return True
+
+    def query_suggests_dev(self, query: str) -> bool:
+        """True when the query itself names a developer category"""
+        return "category" in self.matcher.labels(query.lower())
+
+    def categories(self, text: str) -> List[str]:
+        """Names of the category groups with a pattern occurring in `text` as a whole word.
+
+        Descriptions are free prose, so unlike name classification a pattern must not
+        match inside another word ("ide" in "provide"); a plural ending is allowed.
+        """
+        text = text.lower()
+        return sorted(
+            group for group, patterns in self.category_matcher.matches(text).items()
+            if any(re.search(rf"(?<![a-z0-9]){re.escape(pattern)}(?:e?s)?(?![a-z0-9])", text) for pattern in patterns)
+        )
+
+    def classify(self, name: str, query_is_dev: bool, validated_so_far: int = 0) -> ToolVerdict:
+        """Classify one candidate name, recording the rules that decided it"""
+        tool_lower = name.lower().strip()
+        if len(tool_lower) < 2:
+            return ToolVerdict(name, "skipped", frozenset(), ("too short",), self.version)
+
+        found: Dict[str, List[str]] = self.matcher.matches(tool_lower)
+        trace = []
+
+        if "exclude" in found:
+            if "hard_exclude" in found:
+                trace = [f"exclude:{found['exclude'][0]}", f"hard_exclude:{found['hard_exclude'][0]}"]
+                return ToolVerdict(name, "excluded", frozenset(found), tuple(trace), self.version)
+            if "dev_context" not in found:
+                trace = [f"exclude:{found['exclude'][0]}", "no dev context"]
+                return ToolVerdict(name, "excluded", frozenset(found), tuple(trace), self.version)
+            trace.append(f"exclude:{found['exclude'][0]} overridden by dev_context:{found['dev_context'][0]}")
+
+        technical = "technical" in found and len(tool_lower) > 2
+        include = False
+        for rule in ("known", "category"):
+            if rule in found:
+                trace.append(f"{rule}:{found[rule][0]}")
+                include = True
+        if technical and query_is_dev:
+            trace.append(f"technical:{found['technical'][0]} + dev query")
+            include = True
+        elif technical and validated_so_far < self.min_technical_keep:
+            trace.append(f"technical:{found['technical'][0]} + first {self.min_technical_keep}")
+            include = True
+
+        if "ambiguous" in found:
+            strong = self.strong_matcher.matches(tool_lower.replace(" ", "")).get("strong")
+            if strong:
+                found["strong"] = strong
+                trace.append(f"ambiguous:{found['ambiguous'][0]} confirmed by strong:{strong[0]}")
+            else:
+                trace.append(f"ambiguous:{found['ambiguous'][0]} without strong indicator")
+                include = False
+
+        if "coding" in found:
+            trace.append(f"coding:{found['coding'][0]}")
+            include = True
+
+        return ToolVerdict(
+            name, "validated" if include else "uncertain", frozenset(found), tuple(trace or ["no rule matched"]),
+            self.version
+        )
+
+    def classify_many(self, names: Iterable[str], query: str) -> List[ToolVerdict]:
+        """Classify many candidate names in order.
+
+        Order matters: while fewer than `min_technical_keep` names are validated,
+        technical-looking names are kept even without a dev query.
+        """
+        query_is_dev = self.query_suggests_dev(query)
+        verdicts = []
+        validated = 0
+        for name in names:
+            verdict = self.classify(name, query_is_dev, validated)
+            if verdict.verdict == "validated":
+                validated += 1
+            verdicts.append(verdict)
+        return verdicts
+
+
+_rulebook = None
+
+
+def get_rulebook() -> Rulebook:
+    """Process-wide rulebook, reloaded whenever its file changes"""
+    global _rulebook
+    if _rulebook is None:
+        _rulebook = Rulebook()
+    else:
+        _rulebook.reload_if_changed()
+    return _rulebook
+
+
+def classify_tools(names: Iterable[str], query: str) -> List[ToolVerdict]:
+    return get_rulebook().classify_many(names, query)
+
+
+def extraction_log() -> DiskCache:
+    """Raw LLM extraction outputs, kept so they can be re-validated without new calls"""
+    return DiskCache(
+        "extractions",
+        ttl_seconds=int(os.getenv("EXTRACTION_LOG_TTL", "2592000")),
+        max_bytes=int(os.getenv("EXTRACTION_LOG_MAX_MB", "20")) * 1024 * 1024
+    )
+
+
+def revalidate_extractions(log: Optional[DiskCache] = None, rulebook: Optional[Rulebook] = None) -> List[dict]:
+    """Re-run the current rules over every logged extraction, offline.
+
+    Returns one record per logged extraction with the names the current rules
+    newly accept or reject compared with what was validated at the time.
+    """
+    log = log or extraction_log()
+    rulebook = rulebook or get_rulebook()
+    report = []
+    for value in log.values():
+        try:
+            entry = json.loads(value)
+        except ValueError:
+            continue
+        verdicts = rulebook.classify_many(entry.get("candidates", []), entry.get("query", ""))
+        validated = [verdict.name for verdict in verdicts if verdict.verdict == "validated"]
+        before = set(entry.get("validated", []))
+        report.append({
+            "kind": entry.get("kind", ""),
+            "query": entry.get("query", ""),
+            "rules_version": entry.get("rules_version"),
+            "validated": validated,
+            "added": [name for name in validated if name not in before],
+            "removed": [name for name in entry.get("validated", []) if name not in validated],
+            "verdicts": verdicts,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+
+    console = Console()
+    rules = get_rulebook()
+    report = revalidate_extractions(rulebook=rules)
+    changed = [record for record in report if record["added"] or record["removed"]]
+    console.print(f"[bold]🔁 Re-validated {len(report)} logged extractions with rules v{rules.version}[/bold]")
+    for record in changed:
+        console.print(f"\n[cyan]{record['kind']}:[/cyan] {record['query']} [dim](logged with v{record['rules_version']})[/dim]")
+        for verdict in record["verdicts"]:
+            if verdict.name in record["added"]:
+                console.print(f"  [green]+ {verdict.name}[/green] [dim]{'; '.join(verdict.trace)}[/dim]")
+            elif verdict.name in record["removed"]:
+                console.print(f"  [red]- {verdict.name}[/red] [dim]{'; '.join(verdict.trace)}[/dim]")
+    console.print(f"\n[bold]{len(changed)} of {len(report)} extractions would change[/bold]")
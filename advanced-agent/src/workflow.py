@@ -1,7 +1,8 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from pydantic import ValidationError
 from langgraph.graph import StateGraph, END
 from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -11,7 +12,21 @@ from rich import print as rprint
 from .models import ResearchState, CompanyInfo, CompanyAnalysis, DetailedAnalysis, ComparisonMatrix
 from .firecrawl import FirecrawlService
 from .prompts import DeveloperToolsPrompts
+from .rate_limit import get_rate_limiter, groq_limits
+from .router import MIN_PERCENTILE_SAMPLES, ModelRouter, classify_llm_error
+from .tokens import estimate_message_tokens, prompt_token_limit
+from .relevance import select_relevant
+from .validation import classify_tools, extraction_log
+from .entities import EntityResolver, entity_key
+from .knowledge_base import get_knowledge_base
+from .sections import DETAILED_ANALYSIS_SECTIONS, SectionIndex, extract_score
+from .cache import DiskCache, cache_enabled, content_key
+from .singleflight import SingleFlight
+from .utils import run_sync
+import asyncio
+import json
 import os
+import time
 
 
 class Workflow:
@@ -19,7 +34,8 @@ class Workflow:
         self.console = Console()
         self.firecrawl = FirecrawlService()
 
-        # Model fallback system - ordered by preference (speed vs accuracy)
+        # Candidate models - ordered by preference (speed vs accuracy); the router picks
+        # among them by measured latency and health
         self.available_models = [
             "llama-3.1-8b-instant",      # Fastest, highest rate limits
             "llama-3.1-70b-versatile",   # Balanced speed and accuracy
@@ -27,53 +43,312 @@ class Workflow:
             "mixtral-8x7b-32768",        # Alternative high-quality model
             "gemma2-9b-it",              # Backup option
         ]
-        self.current_model_index = 0
-        self.llm = self._create_llm()
+        self.router = ModelRouter(self.available_models)
+        self._llms = {}
+        # Wait this long at most for a cooled-down model when every model is rate limited
+        self.max_cooldown_wait = float(os.getenv("MAX_COOLDOWN_WAIT", "30"))
+        # Model calls per request across all models (and cooldown waits) before giving up
+        self.max_model_attempts = int(os.getenv("MAX_MODEL_ATTEMPTS", "6"))
+        # Hedging: when a call outlives this percentile of the model's recent latency,
+        # send the same request to a second model and keep whichever answers first
+        self.hedge_requests = os.getenv("HEDGE_REQUESTS", "false").lower() in {"true", "1", "yes"}
+        self.hedge_percentile = float(os.getenv("HEDGE_PERCENTILE", "90"))
+        # Stream long completions (recommendations, detailed analyses, comparisons) to the console
+        self.stream_output = os.getenv("STREAM_OUTPUT", "true").lower() not in {"false", "0", "no"}
+        self.max_concurrent_tools = int(os.getenv("MAX_CONCURRENT_TOOLS", "4"))
+        # Distinct tools researched per query
+        self.research_slots = int(os.getenv("RESEARCH_SLOTS", "4"))
+        # Analyze all researched tools in one LLM call instead of one call per tool
+        self.batch_analysis = os.getenv("BATCH_ANALYSIS", "true").lower() not in {"false", "0", "no"}
+        self.rate_limiter = get_rate_limiter()
+        # Concurrent identical prompts (same tool reached via two paths) share one LLM call
+        self.llm_inflight = SingleFlight()
+        self.response_cache = None
+        self.analysis_cache = None
+        self.extraction_log = None
+        self.knowledge_base = None
+        if cache_enabled():
+            self.extraction_log = extraction_log()
+            if os.getenv("KNOWLEDGE_BASE", "true").lower() not in {"false", "0", "no"}:
+                self.knowledge_base = get_knowledge_base()
+            self.response_cache = DiskCache(
+                "llm",
+                ttl_seconds=int(os.getenv("LLM_CACHE_TTL", "604800")),
+                max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024
+            )
+            self.analysis_cache = DiskCache(
+                "analysis",
+                ttl_seconds=int(os.getenv("ANALYSIS_CACHE_TTL", "2592000")),
+                max_bytes=int(os.getenv("ANALYSIS_CACHE_MAX_MB", "50")) * 1024 * 1024
+            )
+        # Completion tokens also count against tokens/min; reserve a typical response size up front
+        self.expected_output_tokens = int(os.getenv("EXPECTED_OUTPUT_TOKENS", "512"))
+        # Page-content allowance per prompt, in estimated tokens; a smaller model limit lowers it further
+        self.article_content_tokens = int(os.getenv("ARTICLE_CONTENT_TOKENS", "450"))
+        self.analysis_content_tokens = int(os.getenv("ANALYSIS_CONTENT_TOKENS", "650"))
+        self.detailed_content_tokens = int(os.getenv("DETAILED_CONTENT_TOKENS", "1000"))
         self.prompts = DeveloperToolsPrompts()
+        # Stored analyses are invalidated automatically when the prompt or schema changes
+        self.analysis_prompt_version = content_key(
+            self.prompts.tool_analysis_version(), json.dumps(CompanyAnalysis.model_json_schema(), sort_keys=True)
+        )
         self.workflow = self._build_workflow()
 
-    def _create_llm(self):
-        """Create LLM instance with current model"""
-        current_model = self.available_models[self.current_model_index]
+    def _create_llm(self, model: str):
+        """Create LLM instance for a model"""
         return ChatGroq(
-            model=current_model,
+            model=model,
             temperature=0.1,
             groq_api_key=os.getenv("GROQ_API_KEY")
         )
 
-    def _switch_model(self):
-        """Switch to next available model when rate limited"""
-        if self.current_model_index < len(self.available_models) - 1:
-            self.current_model_index += 1
-            old_model = self.available_models[self.current_model_index - 1]
-            new_model = self.available_models[self.current_model_index]
-            self.console.print(f"[yellow]🔄 Switching from {old_model} to {new_model}[/yellow]")
-            self.llm = self._create_llm()
-            return True
-        else:
-            self.console.print(f"[red]❌ All models exhausted. Please wait before retrying.[/red]")
-            return False
+    def _llm_for(self, model: str):
+        if model not in self._llms:
+            self._llms[model] = self._create_llm(model)
+        return self._llms[model]
+
+    async def _acquire_llm_budget(self, model: str, messages):
+        """Wait for request and token budget on a model before calling it"""
+        rpm, tpm = groq_limits(model)
+        await self.rate_limiter.acquire(f"groq:{model}:requests", rpm)
+        await self.rate_limiter.acquire(
+            f"groq:{model}:tokens", tpm, estimate_message_tokens(messages) + self.expected_output_tokens
+        )
 
-    def _invoke_with_fallback(self, messages, operation_name="operation"):
-        """Invoke LLM with automatic model fallback on rate limits"""
-        max_retries = len(self.available_models)
+    def _fit_contents(self, operation_name: str, build, contents: List[str], max_tokens: int,
+                      query) -> List[str]:
+        """Reduce page contents so the prompt built from them fits the model likely to serve it.
+
+        `build(contents)` returns the prompt messages. Each content gets an equal share of
+        what that model accepts after the fixed prompt text, capped at `max_tokens`, and is
+        filled with its sections most relevant to `query` rather than its first lines
+        (`query` may also be a list with one query per content).
+        """
+        model = self.router.choose(operation_name) or self.available_models[0]
+        fixed = estimate_message_tokens(build([""] * len(contents)))
+        room = prompt_token_limit(model, self.expected_output_tokens) - fixed
+        share = max(0, min(max_tokens, room // max(1, len(contents))))
+        queries = query if isinstance(query, list) else [query] * len(contents)
+        return [select_relevant(content, q, share) for content, q in zip(contents, queries)]
+
+    @staticmethod
+    def _analysis_relevance_query(company_name: str) -> str:
+        """Terms behind the CompanyAnalysis fields, used to pick the useful parts of a vendor page"""
+        return (
+            f"{company_name} pricing free plan paid enterprise open source github stars api sdk "
+            f"languages python javascript integrations customers users funding developers"
+        )
+
+    @staticmethod
+    def _messages_key(messages, *extra) -> str:
+        """Content hash identifying a prompt"""
+        return content_key(*extra, *(f"{message.type}:{message.content}" for message in messages))
+
+    async def _ainvoke_with_fallback(self, messages, operation_name="operation", stream=False):
+        """Invoke LLM with model fallback; identical prompts already in flight share one call.
 
-        for attempt in range(max_retries):
+        With `stream`, tokens are printed as they arrive; the full response is still returned.
+        """
+        on_token = self._print_token if stream and self.stream_output else None
+        try:
+            return await self.llm_inflight.do(
+                self._messages_key(messages), lambda: self._ainvoke_models(messages, operation_name, on_token=on_token)
+            )
+        finally:
+            if on_token:
+                self.console.print()
+
+    def _print_token(self, text: str):
+        self.console.print(text, end="", style="dim", markup=False, highlight=False, soft_wrap=True)
+
+    async def _ainvoke_models(self, messages, operation_name="operation", schema=None, on_token=None):
+        """Invoke the best available model, moving on to others when one is rate limited or gone.
+
+        With `schema`, the call uses structured output and returns a parsed model instead.
+        With `on_token`, the completion is streamed and each text chunk is passed to it.
+        """
+        # Prompts are deterministic enough at temperature 0.1 to replay exact matches. A hit
+        # from any model is answered before routing: it costs no budget, so neither a cooldown
+        # nor the latency ranking should send the request to a model without one
+        if schema is None:
+            cached = await self._get_any_cached_response(messages)
+            if cached is not None:
+                if on_token:
+                    on_token(cached.content)
+                return cached
+
+        tried, oversized = set(), set()
+        attempts, waited = 0, 0.0
+
+        while True:
+            model = self.router.choose(operation_name, exclude=tried | oversized)
+            if model is None:
+                # Wait for the soonest rate-limited model to reset. Cooldown waits and calls are
+                # both capped across the whole request, so models that keep failing or keep
+                # reporting short cooldowns can't loop forever
+                wait = self.router.next_available_in(exclude=oversized)
+                if wait is None or waited + wait > self.max_cooldown_wait or attempts >= self.max_model_attempts:
+                    self.console.print(f"[red]❌ All models exhausted. Please wait before retrying.[/red]")
+                    raise Exception(f"All models failed for {operation_name}")
+                await asyncio.sleep(wait)
+                waited += wait
+                tried.clear()
+                continue
+
+            if estimate_message_tokens(messages) > prompt_token_limit(model, self.expected_output_tokens):
+                # Groq would reject the request as too large; don't spend a call finding that out
+                self.console.print(f"[dim]↪️ Prompt for {operation_name} is too large for {model}, trying another model[/dim]")
+                oversized.add(model)
+                continue
+
+            if attempts >= self.max_model_attempts:
+                self.console.print(f"[red]❌ Gave up on {operation_name} after {attempts} model calls.[/red]")
+                raise Exception(f"All models failed for {operation_name}")
+            attempts += 1
             try:
-                return self.llm.invoke(messages)
+                model, response = await self._ainvoke_hedged(
+                    model, messages, operation_name, schema, tried | oversized, on_token
+                )
             except Exception as e:
-                error_str = str(e).lower()
-                if "rate_limit" in error_str or "429" in error_str or "quota" in error_str:
-                    self.console.print(f"[yellow]⚠️ Rate limit hit for {operation_name} with {self.available_models[self.current_model_index]}[/yellow]")
-                    if not self._switch_model():
-                        raise e
-                    continue
-                else:
-                    # Non-rate-limit error, re-raise immediately
-                    raise e
+                kind = classify_llm_error(e)
+                if kind == "fatal":
+                    # Not a model health problem, re-raise immediately
+                    raise
+                reason = {"rate_limit": "Rate limit hit", "transient": "Model error"}.get(kind, "Model unavailable")
+                self.console.print(f"[yellow]⚠️ {reason} for {operation_name} with {model}, trying another model[/yellow]")
+                tried.add(model)
+                continue
+
+            if schema is None:
+                await self._store_cached_response(model, messages, response)
+            return response
+
+    async def _acall_model(self, model: str, messages, operation_name: str, schema=None, on_token=None,
+                           budget_ready: Optional[asyncio.Event] = None):
+        """One budgeted, timed call to a model; the outcome is reported to the router.
+
+        `budget_ready` is set once the rate-limit budget is granted and the request goes out.
+        """
+        llm = self._llm_for(model)
+        if schema is not None:
+            llm = llm.with_structured_output(schema)
+
+        await self._acquire_llm_budget(model, messages)
+        if budget_ready is not None:
+            budget_ready.set()
+        started = time.monotonic()
+        chunks = []
+        try:
+            if on_token and schema is None:
+                async for chunk in llm.astream(messages):
+                    if chunk.content:
+                        on_token(chunk.content)
+                        chunks.append(chunk.content)
+                response = AIMessage(content="".join(chunks))
+            else:
+                response = await llm.ainvoke(messages)
+        except Exception as e:
+            if chunks:
+                # End the partial line before the fallback notice; the next model starts over
+                self.console.print()
+            self.router.record_error(model, e)
+            raise
+        self.router.record_success(model, time.monotonic() - started, operation_name)
+        return response
+
+    async def _ainvoke_hedged(self, model: str, messages, operation_name: str, schema, tried,
+                              on_token=None) -> Tuple[str, Any]:
+        """Call `model`, hedging onto a second healthy model if it runs slow.
+
+        Returns (winning model, response). If both calls fail, the primary's error is raised.
+        Streamed calls are never hedged, since two streams can't share the console. The hedge
+        delay counts from when the primary gets its rate-limit budget, not from when it starts
+        waiting for it, so a queued call doesn't spend a second model's budget.
+        """
+        delay = None
+        if self.hedge_requests and on_token is None:
+            delay = self.router.latency_percentile(
+                model, self.hedge_percentile, operation_name, min_samples=MIN_PERCENTILE_SAMPLES
+            )
+        if delay is None:
+            return model, await self._acall_model(model, messages, operation_name, schema, on_token)
+
+        budget_ready = asyncio.Event()
+        primary = asyncio.create_task(self._acall_model(model, messages, operation_name, schema,
+                                                        budget_ready=budget_ready))
+        budget_wait = asyncio.create_task(budget_ready.wait())
+        tasks = {primary: model}
+        try:
+            await asyncio.wait({primary, budget_wait}, return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            backup_model = None if done else self.router.choose(operation_name, exclude=set(tried) | {model})
+            if backup_model is None:
+                return model, await primary
+
+            self.console.print(f"[dim]⏱️ {operation_name} on {model} is past p{self.hedge_percentile:g} ({delay:.1f}s), hedging with {backup_model}[/dim]")
+            backup = asyncio.create_task(self._acall_model(backup_model, messages, operation_name, schema))
+            tasks[backup] = backup_model
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return tasks[task], task.result()
+            raise primary.exception()
+        finally:
+            # Cancel the loser (or both, if we were cancelled) and wait for them to unwind
+            budget_wait.cancel()
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def _get_cached_response(self, model: str, messages) -> Optional[AIMessage]:
+        if not self.response_cache:
+            return None
+        content = await self.response_cache.aget(self._messages_key(messages, model))
+        return AIMessage(content=content) if content is not None else None
 
-        # If we get here, all models failed
-        raise Exception(f"All models failed for {operation_name}")
+    async def _get_any_cached_response(self, messages) -> Optional[AIMessage]:
+        """Cached answer to this prompt from any candidate model, in preference order"""
+        if not self.response_cache:
+            return None
+        for model in self.router.models:
+            cached = await self._get_cached_response(model, messages)
+            if cached is not None:
+                return cached
+        return None
+
+    async def _store_cached_response(self, model: str, messages, response):
+        content = getattr(response, "content", None)
+        if self.response_cache and isinstance(content, str) and content.strip():
+            await self.response_cache.aset(self._messages_key(messages, model), content)
+
+    def _analysis_cache_key(self, company_name: str, content: str) -> str:
+        return content_key(company_name.lower().strip(), content_key(content), self.analysis_prompt_version)
+
+    async def _get_cached_analysis(self, cache_key: str) -> Optional[CompanyAnalysis]:
+        if not self.analysis_cache:
+            return None
+        payload = await self.analysis_cache.aget(cache_key)
+        if not payload:
+            return None
+        try:
+            return CompanyAnalysis.model_validate_json(payload)
+        except Exception:
+            await self.analysis_cache.adelete(cache_key)
+            return None
+
+    async def _store_cached_analysis(self, cache_key: str, analysis):
+        if self.analysis_cache and isinstance(analysis, CompanyAnalysis):
+            await self.analysis_cache.aset(cache_key, analysis.model_dump_json())
+
+    def cache_stats(self) -> list:
+        """Hit/miss statistics for the LLM response cache and the Firecrawl caches"""
+        stats = [cache.stats() for cache in (self.response_cache, self.analysis_cache) if cache]
+        return stats + self.firecrawl.cache_stats()
 
     def _build_workflow(self):
         graph = StateGraph(ResearchState)
@@ -86,37 +361,41 @@ class Workflow:
         graph.add_edge("analyze", END)
         return graph.compile()
 
-    def _extract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
-        self.console.print(f"[bold blue]🔍 Finding articles about:[/bold blue] [cyan]{state.query}[/cyan]")
-
+    @staticmethod
+    def _article_query(query: str) -> str:
+        """Article search for a user query; tool extraction and market leaders both use it,
+        so every query form shares one search and its pages"""
         # Improve search strategy with developer-focused terms
-        if "alternate" in state.query.lower() or "alternative" in state.query.lower():
+        if "alternate" in query.lower() or "alternative" in query.lower():
             # Extract the tool name from queries like "alternate for X" or "alternative to X"
-            tool_name = state.query.lower().replace("alternate for", "").replace("alternative to", "").replace("alternative for", "").strip()
-            article_query = f"{tool_name} alternatives developer tools comparison software engineering best"
-        else:
-            # Add developer-specific terms to improve search precision
-            dev_terms = "developer tools software engineering programming"
-            article_query = f"best {state.query} {dev_terms} comparison top tools 2024"
+            tool_name = query.lower().replace("alternate for", "").replace("alternative to", "").replace("alternative for", "").strip()
+            return f"{tool_name} alternatives developer tools comparison software engineering best"
+        # Add developer-specific terms to improve search precision
+        dev_terms = "developer tools software engineering programming"
+        return f"best {query} {dev_terms} comparison top tools 2024"
 
-        search_results = self.firecrawl.search_companies(article_query, num_results=4)
+    async def _extract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
+        self.console.print(f"[bold blue]🔍 Finding articles about:[/bold blue] [cyan]{state.query}[/cyan]")
+
+        article_query = self._article_query(state.query)
+        search_results = await self.firecrawl.asearch_companies(article_query, num_results=4)
 
-        all_content = ""
         # Handle both list and object with data attribute
         results_list = search_results.data if hasattr(search_results, 'data') else search_results
-        for result in results_list:
-            url = result.get("url", "")
-            scraped = self.firecrawl.scrape_company_pages(url)
-            if scraped:
-                all_content += scraped.markdown[:1500] + "\n\n"
+        contents = [content for content in await self.firecrawl.aget_page_contents(results_list) if content]
 
-        messages = [
-            SystemMessage(content=self.prompts.TOOL_EXTRACTION_SYSTEM),
-            HumanMessage(content=self.prompts.tool_extraction_user(state.query, all_content))
-        ]
+        def build(parts):
+            all_content = "".join(part + "\n\n" for part in parts)
+            return [
+                SystemMessage(content=self.prompts.TOOL_EXTRACTION_SYSTEM),
+                HumanMessage(content=self.prompts.tool_extraction_user(state.query, all_content))
+            ]
+
+        relevance_query = f"{state.query} {article_query} tools list"
+        messages = build(self._fit_contents("tool extraction", build, contents, self.article_content_tokens, relevance_query))
 
         try:
-            response = self._invoke_with_fallback(messages, "tool extraction")
+            response = await self._ainvoke_with_fallback(messages, "tool extraction")
             raw_tool_names = [
                 name.strip()
                 for name in response.content.strip().split("\n")
@@ -124,7 +403,10 @@ class Workflow:
             ]
 
             # Validate and filter tools to ensure they're relevant
-            validated_tools = self._validate_developer_tools(raw_tool_names, state.query)
+            # Classification may hot-reload the rules file and the extraction log is SQLite
+            validated_tools = await asyncio.to_thread(
+                self._validate_developer_tools, raw_tool_names, state.query, log_as="tool extraction"
+            )
 
             self.console.print(f"[bold green]✅ Extracted tools:[/bold green] [yellow]{', '.join(validated_tools[:5])}[/yellow]")
             return {"extracted_tools": validated_tools}
@@ -136,298 +418,319 @@ class Workflow:
                 self.console.print(f"[bold red]❌ Error extracting tools:[/bold red] {e}")
             return {"extracted_tools": []}
 
-    def _validate_developer_tools(self, tool_names: List[str], query: str) -> List[str]:
-        """Validate that extracted tools are actually developer tools and relevant to the query"""
-        validated_tools = []
-
-        # Comprehensive list of non-developer business patterns to exclude
-        exclude_patterns = [
-            # E-commerce & Retail
-            "watch", "jewelry", "fashion", "clothing", "retail", "shop", "store", "marketplace", "ecommerce",
-            "boutique", "outlet", "mall", "shopping", "cart", "checkout", "payment", "wallet",
-
-            # Food & Hospitality
-            "restaurant", "food", "cafe", "coffee", "dining", "menu", "recipe", "kitchen", "cooking",
-            "hotel", "travel", "booking", "vacation", "tourism", "flight", "airline",
-
-            # Finance & Insurance (non-fintech)
-            "insurance", "loan", "mortgage", "credit", "bank", "investment", "trading", "forex",
-            "accounting", "tax", "audit", "financial advisor", "wealth management",
-
-            # Healthcare & Medical
-            "medical", "healthcare", "hospital", "clinic", "doctor", "pharmacy", "medicine", "health",
-            "fitness", "gym", "workout", "nutrition", "wellness", "therapy",
-
-            # Real Estate & Automotive
-            "real estate", "property", "house", "home", "apartment", "rental", "lease",
-            "automotive", "car", "vehicle", "auto", "mechanic", "garage", "dealership",
-
-            # Entertainment & Media
-            "movie", "film", "music", "game", "entertainment", "media", "news", "magazine",
-            "sports", "betting", "casino", "gambling",
-
-            # Education (non-technical)
-            "school", "university", "college", "education", "learning", "course", "training",
-            "tutoring", "academic", "student",
-
-            # Legal & Professional Services
-            "legal", "law", "lawyer", "attorney", "court", "consulting", "advisory",
-            "marketing", "advertising", "agency", "design studio"
-        ]
-
-        # Comprehensive developer tool categories and technologies
-        dev_categories = [
-            # Development & Programming
-            "api", "sdk", "framework", "library", "ide", "editor", "compiler", "interpreter",
-            "programming", "coding", "development", "software", "application", "app",
-
-            # DevOps & Infrastructure
-            "ci/cd", "continuous integration", "continuous deployment", "pipeline", "build",
-            "deployment", "devops", "infrastructure", "provisioning", "automation",
-            "orchestration", "configuration management",
-
-            # Cloud & Hosting
-            "cloud", "hosting", "server", "serverless", "paas", "iaas", "saas", "platform",
-            "aws", "azure", "gcp", "google cloud", "digital ocean", "heroku", "vercel", "netlify",
-
-            # Databases & Storage
-            "database", "db", "sql", "nosql", "mongodb", "postgresql", "mysql", "redis",
-            "elasticsearch", "storage", "data", "warehouse", "lake", "cache", "memory",
-
-            # Containers & Orchestration
-            "container", "docker", "kubernetes", "k8s", "pod", "cluster", "microservice",
-            "service mesh", "istio", "helm", "container registry",
-
-            # Monitoring & Observability
-            "monitoring", "observability", "logging", "metrics", "tracing", "alerting",
-            "dashboard", "analytics", "performance", "apm", "error tracking",
-
-            # Security & Authentication
-            "security", "authentication", "authorization", "oauth", "jwt", "sso", "identity",
-            "access control", "encryption", "certificate", "ssl", "tls", "firewall",
-
-            # Testing & Quality
-            "testing", "test", "qa", "quality assurance", "automation", "unit test",
-            "integration test", "e2e", "performance test", "load test", "security test",
-
-            # Version Control & Collaboration
-            "version control", "git", "github", "gitlab", "bitbucket", "repository", "repo",
-            "collaboration", "code review", "pull request", "merge request",
-
-            # Communication & Project Management (dev-focused)
-            "slack", "discord", "teams", "jira", "confluence", "notion", "trello", "asana",
-            "project management", "issue tracking", "bug tracking", "agile", "scrum",
-
-            # Development Tools
-            "webpack", "babel", "npm", "yarn", "pip", "maven", "gradle", "make", "cmake",
-            "linter", "formatter", "debugger", "profiler", "bundler", "transpiler"
-        ]
-
-        # Known legitimate developer tools (whitelist for common cases)
-        known_dev_tools = [
-            # CI/CD & DevOps
-            "jenkins", "github actions", "gitlab ci", "circleci", "travis ci", "azure devops",
-            "docker", "kubernetes", "terraform", "ansible", "chef", "puppet",
-
-            # Cloud & Hosting
-            "aws", "azure", "gcp", "heroku", "vercel", "netlify", "digital ocean",
-
-            # Databases
-            "mongodb", "postgresql", "mysql", "redis", "elasticsearch", "cassandra",
-
-            # Frameworks & Libraries
-            "react", "vue", "angular", "node.js", "express", "django", "flask", "spring",
-
-            # Monitoring & Analytics
-            "prometheus", "grafana", "datadog", "new relic", "splunk", "elk stack",
-
-            # Testing & API Tools
-            "jest", "cypress", "selenium", "postman", "insomnia", "swagger",
-
-            # Code Editors & IDEs
-            "vscode", "intellij", "sublime", "atom", "vim", "emacs", "cursor", "zed",
-            "webstorm", "pycharm", "phpstorm", "rubymine", "goland", "clion", "notepad++",
-
-            # AI Coding Assistants & Modern Editors
-            "github copilot", "copilot", "claude code", "codemate", "tabnine", "kite",
-            "codium", "codewhisperer", "replit", "ghostwriter", "cursor", "zed", "windsurf",
-            "aider", "continue", "sourcegraph", "cody", "blackbox", "mintlify", "pieces",
+    def _validate_developer_tools(self, tool_names: List[str], query: str, log_as: Optional[str] = None) -> List[str]:
+        """Validate that extracted tools are actually developer tools and relevant to the query.
 
-            # Version Control
-            "git", "github", "gitlab", "bitbucket", "subversion"
-        ]
-
-        for tool_name in tool_names:
-            tool_lower = tool_name.lower().strip()
-            query_lower = query.lower()
-
-            # Skip empty or very short names
-            if len(tool_lower) < 2:
-                continue
-
-            # Skip if tool name contains excluded business patterns (but be smart about context)
-            is_excluded = False
-            for pattern in exclude_patterns:
-                if pattern in tool_lower:
-                    # Check if it's a false positive (e.g., "Weather Cloud Service" has "cloud" which is dev-related)
-                    dev_context_words = ["cloud", "server", "platform", "service", "api", "database", "monitor", "security", "system"]
-                    has_dev_context = any(dev_word in tool_lower for dev_word in dev_context_words)
-
-                    # Only exclude if it's clearly non-dev and doesn't have dev context
-                    if not has_dev_context or pattern in ["watch", "fashion", "restaurant", "hotel", "insurance", "medical"]:
-                        is_excluded = True
-                        break
-
-            if is_excluded:
-                self.console.print(f"[dim]❌ Filtered out non-dev tool: {tool_name}[/dim]")
-                continue
-
-            # Include if it's a known developer tool
-            is_known_dev_tool = any(known_tool in tool_lower for known_tool in known_dev_tools)
-
-            # Include if it matches developer categories
-            matches_dev_category = any(category in tool_lower for category in dev_categories)
-
-            # Include if query context suggests it's a dev tool
-            query_suggests_dev = any(category in query_lower for category in dev_categories)
-
-            # Additional validation: check if tool name has technical indicators
-            technical_indicators = [
-                # Programming languages & extensions
-                "js", "py", "go", "rs", "ts", "java", "cpp", "php", "rb", "swift", "kotlin", "scala", "dart",
-
-                # Technical domains
-                "io", "dev", "tech", "code", "soft", "app", "ai", "ml", "data", "web", "mobile", "backend", "frontend",
-
-                # Infrastructure & platforms
-                "hub", "lab", "cloud", "server", "base", "stack", "kit", "tool", "platform", "ops", "deploy",
-                "api", "sdk", "framework", "service", "system", "engine", "db", "sql", "nosql", "graph",
-
-                # Development concepts
-                "editor", "ide", "copilot", "assistant", "mate", "pilot", "studio", "workspace", "terminal",
-                "shell", "cli", "gui", "ui", "ux", "build", "test", "debug", "lint", "format", "bundle",
-
-                # Modern development terms
-                "ci", "cd", "devops", "microservice", "container", "serverless", "jamstack", "headless",
-                "graphql", "rest", "grpc", "webhook", "oauth", "jwt", "ssl", "tls", "cdn", "edge"
-            ]
-            has_technical_indicators = any(indicator in tool_lower for indicator in technical_indicators)
-
-            # Enhanced decision logic with better context awareness
-            should_include = (
-                is_known_dev_tool or
-                matches_dev_category or
-                (query_suggests_dev and has_technical_indicators and len(tool_lower) > 2) or  # Relaxed length requirement
-                (len(validated_tools) < 3 and has_technical_indicators and len(tool_lower) > 2)  # Keep at least 3 if they seem technical
-            )
-
-            # Special handling for ambiguous cases (but be more lenient for coding tools)
-            ambiguous_patterns = ["monitor", "weather", "health"]  # Removed "security" as it's often dev-related
-            if any(pattern in tool_lower for pattern in ambiguous_patterns):
-                # For ambiguous tools, require stronger dev context
-                strong_dev_indicators = ["prometheus", "grafana", "datadog", "splunk", "newrelic", "sentry", "security"]
-                if not any(indicator in tool_lower.replace(" ", "") for indicator in strong_dev_indicators):
-                    should_include = False
-
-            # Special boost for common coding tool patterns
-            coding_tool_patterns = ["code", "editor", "ide", "copilot", "assistant", "mate", "pilot", "studio"]
-            if any(pattern in tool_lower for pattern in coding_tool_patterns):
-                should_include = True  # Always include obvious coding tools
-
-            if should_include:
-                validated_tools.append(tool_name)
-                self.console.print(f"[dim]✅ Validated dev tool: {tool_name}[/dim]")
-            else:
-                self.console.print(f"[dim]❓ Uncertain tool filtered: {tool_name}[/dim]")
+        With `log_as`, the raw candidates are kept in the extraction log for offline re-validation.
+        """
+        validated_tools = []
+        verdicts = classify_tools(tool_names, query)
+        for verdict in verdicts:
+            trace = "; ".join(verdict.trace)
+            if verdict.verdict == "excluded":
+                self.console.print(f"[dim]❌ Filtered out non-dev tool: {verdict.name} ({trace})[/dim]")
+            elif verdict.verdict == "validated":
+                validated_tools.append(verdict.name)
+                self.console.print(f"[dim]✅ Validated dev tool: {verdict.name}[/dim]")
+            elif verdict.verdict == "uncertain":
+                self.console.print(f"[dim]❓ Uncertain tool filtered: {verdict.name} ({trace})[/dim]")
+
+        if log_as and self.extraction_log:
+            self.extraction_log.set(content_key(log_as, query.lower().strip()), json.dumps({
+                "kind": log_as,
+                "query": query,
+                "candidates": list(tool_names),
+                "validated": validated_tools,
+                "rules_version": verdicts[0].rules_version if verdicts else None,
+            }))
 
         return validated_tools[:5]  # Limit to 5 tools
 
-    def _analyze_company_content(self, company_name: str, content: str) -> CompanyAnalysis:
-        structured_llm = self.llm.with_structured_output(CompanyAnalysis)
+    async def _analyze_company_content(self, company_name: str, content: str) -> Optional[CompanyAnalysis]:
+        """Structured analysis of one tool's page; None when every model failed"""
+        # Unchanged vendor pages reuse their stored analysis instead of a multi-second LLM call
+        cache_key = self._analysis_cache_key(company_name, content)
+        cached = await self._get_cached_analysis(cache_key)
+        if cached:
+            return cached
+
+        def build(parts):
+            return [
+                SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
+                HumanMessage(content=self.prompts.tool_analysis_user(company_name, parts[0]))
+            ]
 
-        messages = [
-            SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
-            HumanMessage(content=self.prompts.tool_analysis_user(company_name, content))
-        ]
+        messages = build(self._fit_contents(
+            "tool analysis", build, [content], self.analysis_content_tokens, self._analysis_relevance_query(company_name)
+        ))
 
         try:
-            analysis = structured_llm.invoke(messages)
+            key = self._messages_key(messages, "CompanyAnalysis")
+            analysis = await self.llm_inflight.do(
+                key, lambda: self._ainvoke_models(messages, "tool analysis", schema=CompanyAnalysis)
+            )
+            await self._store_cached_analysis(cache_key, analysis)
             return analysis
         except Exception as e:
             self.console.print(f"[bold red]❌ Analysis error:[/bold red] {e}")
-            return CompanyAnalysis(
-                pricing_model="Unknown",
-                is_open_source=None,
-                tech_stack=[],
-                description="Failed",
-                api_available=None,
-                language_support=[],
-                integration_capabilities=[],
-            )
+            return None
 
 
-    def _research_step(self, state: ResearchState) -> Dict[str, Any]:
+    async def _research_step(self, state: ResearchState) -> Dict[str, Any]:
         extracted_tools = getattr(state, "extracted_tools", [])
 
         if not extracted_tools:
             self.console.print("[bold yellow]⚠️ No extracted tools found, falling back to direct search[/bold yellow]")
-            search_results = self.firecrawl.search_companies(state.query, num_results=4)
+            search_results = await self.firecrawl.asearch_companies(state.query, num_results=4)
             results_list = search_results.data if hasattr(search_results, 'data') else search_results
             tool_names = [
                 result.get("metadata", {}).get("title", "Unknown")
                 for result in results_list
             ]
         else:
-            tool_names = extracted_tools[:4]
-
-        self.console.print(f"[bold magenta]🔬 Researching specific tools:[/bold magenta] [green]{', '.join(tool_names)}[/green]")
-
-        companies = []
-        for tool_name in tool_names:
-            # Add developer-specific search terms to improve precision
-            search_terms = f"{tool_name} developer tool software engineering official site"
-            tool_search_results = self.firecrawl.search_companies(search_terms, num_results=1)
-
-            if tool_search_results:
-                results_list = tool_search_results.data if hasattr(tool_search_results, 'data') else tool_search_results
-                result = results_list[0] if results_list else None
-
-                if result:
-                    url = result.get("url", "")
-
-                    company = CompanyInfo(
-                        name=tool_name,
-                        description=result.get("markdown", ""),
-                        website=url,
-                        tech_stack=[],
-                        competitors=[]
-                    )
-
-                    scraped = self.firecrawl.scrape_company_pages(url)
-                    if scraped:
-                        content = scraped.markdown
-                        analysis = self._analyze_company_content(company.name, content)
-
-                        company.pricing_model = analysis.pricing_model
-                        company.is_open_source = analysis.is_open_source
-                        company.tech_stack = analysis.tech_stack
-                        company.description = analysis.description
-                        company.api_available = analysis.api_available
-                        company.language_support = analysis.language_support
-                        company.integration_capabilities = analysis.integration_capabilities
-                        # Market intelligence fields
-                        company.market_position = analysis.market_position
-                        company.company_size = analysis.company_size
-                        company.funding_status = analysis.funding_status
-                        company.user_base_size = analysis.user_base_size
-                        company.github_stars = analysis.github_stars
-                        company.market_trends = analysis.market_trends
-
-                    companies.append(company)
+            tool_names = extracted_tools
+
+        # Spellings of the same product ("VS Code" / "Visual Studio Code") share one slot
+        resolver = EntityResolver()
+        candidates, merged = resolver.dedupe(tool_names)
+        for name, kept in merged:
+            self.console.print(f"[dim]🔗 Merged {name} into {kept}[/dim]")
+
+        self.console.print(f"[bold magenta]🔬 Researching specific tools:[/bold magenta] [green]{', '.join(candidates[:self.research_slots])}[/green]")
+
+        # Each tool is looked up independently, so fan out with bounded concurrency
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_tools))
+
+        async def search_with_limit(tool_name: str):
+            async with semaphore:
+                return await self._search_tool_source(tool_name)
+
+        async def content_with_limit(result: Dict[str, Any]):
+            async with semaphore:
+                return await self.firecrawl.aget_page_content(result)
+
+        # Two names can still lead to the same official site; the later one is dropped
+        # before anything is scraped or analyzed, and its slot goes to the next candidate
+        found, slots, pending = [], self.research_slots, candidates
+        while pending and slots > 0:
+            batch, pending = pending[:slots], pending[slots:]
+            slots -= len(batch)
+            # Tools already in the knowledge base (and still fresh) need no network at all
+            known = dict(zip(batch, await asyncio.to_thread(self._known_tools, names=batch)))
+            to_search = [tool_name for tool_name in batch if not known[tool_name]]
+            searched = dict(zip(to_search, await asyncio.gather(
+                *(search_with_limit(tool_name) for tool_name in to_search),
+                return_exceptions=True
+            )))
+            claimed = []
+            for tool_name in batch:
+                if known[tool_name]:
+                    source = (known[tool_name], None)
+                    self.console.print(f"[dim]📚 {tool_name} found in the knowledge base[/dim]")
+                else:
+                    source = searched[tool_name]
+                if isinstance(source, BaseException):
+                    self.console.print(f"[red]❌ Research failed for {tool_name}: {source}[/red]")
+                    continue
+                if not source:
+                    continue
+                owner = resolver.claim_site(tool_name, source[0].website)
+                if owner:
+                    self.console.print(f"[dim]🔗 {tool_name} resolves to the same site as {owner}, skipping[/dim]")
+                    slots += 1
+                    continue
+                claimed.append((tool_name, source))
+
+            # A searched tool may already be known under another name through its official site
+            new_sites = [source[0].website for _, source in claimed if source[1] is not None]
+            same_sites = iter(await asyncio.to_thread(self._known_tools, sites=new_sites) if new_sites else [])
+            for tool_name, source in claimed:
+                if source[1] is not None:
+                    same_site = next(same_sites)
+                    if same_site:
+                        self.console.print(f"[dim]📚 {tool_name} is {same_site.name} in the knowledge base[/dim]")
+                        source = (same_site, None)
+                found.append(source)
+
+        # Knowledge-base entries are already analyzed; only new tools are scraped
+        pages = iter(await asyncio.gather(
+            *(content_with_limit(result) for _, result in found if result is not None),
+            return_exceptions=True
+        ))
+
+        companies, contents = [], []
+        for company, result in found:
+            content = next(pages) if result is not None else None
+            if isinstance(content, BaseException):
+                self.console.print(f"[red]❌ Research failed for {company.name}: {content}[/red]")
+                continue
+            companies.append(company)
+            contents.append(content)
+
+        to_analyze = [(company, content) for company, content in zip(companies, contents) if content]
+        analyses = await self._analyze_companies([(company.name, content) for company, content in to_analyze])
+        analyzed = []
+        for (company, content), analysis in zip(to_analyze, analyses):
+            if analysis is None:
+                # Shown as unknown, and never stored in the knowledge base
+                self._apply_analysis(company, CompanyAnalysis(pricing_model="Unknown", description="Failed"))
+                continue
+            self._apply_analysis(company, analysis)
+            analyzed.append((company, content_key(content)))
+        if self.knowledge_base and analyzed:
+            await asyncio.to_thread(self._remember_tools, analyzed)
 
         return {"companies": companies}
 
-    def _analyze_step(self, state: ResearchState) -> Dict[str, Any]:
+    def _known_tools(self, names: List[str] = (), sites: List[str] = ()) -> List[Optional[CompanyInfo]]:
+        """Fresh knowledge-base entries for tool names or official sites (blocking; run it in a thread)"""
+        if not self.knowledge_base:
+            return [None] * (len(names) or len(sites))
+        entries = self.knowledge_base.get_many(names) if names else self.knowledge_base.get_many_by_site(sites)
+        return [
+            entry.company if self.knowledge_base.is_fresh(entry, self.analysis_prompt_version) else None
+            for entry in entries
+        ]
+
+    def _remember_tools(self, analyzed: List[Tuple[CompanyInfo, str]]):
+        """Store freshly analyzed tools with their content hashes (blocking; run it in a thread)"""
+        for company, content_hash in analyzed:
+            self.knowledge_base.upsert(company, content_hash, self.analysis_prompt_version)
+
+    async def _search_tool_source(self, tool_name: str):
+        """Search for a tool's official site; returns (company, search result) or None"""
+        # Add developer-specific search terms to improve precision
+        search_terms = f"{tool_name} developer tool software engineering official site"
+        tool_search_results = await self.firecrawl.asearch_companies(search_terms, num_results=1)
+        if not tool_search_results:
+            return None
+
+        results_list = tool_search_results.data if hasattr(tool_search_results, 'data') else tool_search_results
+        result = results_list[0] if results_list else None
+        if not result:
+            return None
+
+        url = result.get("url", "")
+
+        company = CompanyInfo(
+            name=tool_name,
+            description=result.get("markdown", ""),
+            website=url,
+            tech_stack=[],
+            competitors=[]
+        )
+        return company, result
+
+    @staticmethod
+    def _apply_analysis(company: CompanyInfo, analysis: CompanyAnalysis):
+        company.pricing_model = analysis.pricing_model
+        company.is_open_source = analysis.is_open_source
+        company.tech_stack = analysis.tech_stack
+        company.description = analysis.description
+        company.api_available = analysis.api_available
+        company.language_support = analysis.language_support
+        company.integration_capabilities = analysis.integration_capabilities
+        # Market intelligence fields
+        company.market_position = analysis.market_position
+        company.company_size = analysis.company_size
+        company.funding_status = analysis.funding_status
+        company.user_base_size = analysis.user_base_size
+        company.github_stars = analysis.github_stars
+        company.market_trends = analysis.market_trends
+
+    async def _analyze_companies(self, items: List[Tuple[str, str]]) -> List[Optional[CompanyAnalysis]]:
+        """Analyze several (name, content) pairs, batching uncached ones into a single LLM call.
+
+        Tools whose analysis failed on every model come back as None.
+        """
+        results = list(await asyncio.gather(
+            *(self._get_cached_analysis(self._analysis_cache_key(name, content)) for name, content in items)
+        ))
+
+        pending = [i for i, analysis in enumerate(results) if analysis is None]
+        if self.batch_analysis and len(pending) >= 2:
+            batch = await self._analyze_company_batch([items[i] for i in pending])
+            for i, analysis in zip(pending, batch):
+                results[i] = analysis
+
+        # Anything the batch couldn't produce (or batching disabled) falls back to per-tool calls
+        missing = [i for i, analysis in enumerate(results) if analysis is None]
+        if missing:
+            fallbacks = await asyncio.gather(*(self._analyze_company_content(*items[i]) for i in missing))
+            for i, analysis in zip(missing, fallbacks):
+                results[i] = analysis
+        return results
+
+    async def _analyze_company_batch(self, items: List[Tuple[str, str]]) -> List[Optional[CompanyAnalysis]]:
+        """One structured-analysis call for several tools; unparseable items come back as None"""
+        names = [name for name, _ in items]
+
+        def build(parts):
+            return [
+                SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
+                HumanMessage(content=self.prompts.tool_analysis_batch_user(list(zip(names, parts))))
+            ]
+
+        # Each tool's page is ranked against its own name
+        messages = build(self._fit_contents(
+            "batch tool analysis", build, [content for _, content in items], self.analysis_content_tokens,
+            [self._analysis_relevance_query(name) for name in names]
+        ))
+
+        try:
+            response = await self._ainvoke_with_fallback(messages, "batch tool analysis")
+        except Exception as e:
+            self.console.print(f"[yellow]⚠️ Batch analysis failed, analyzing tools individually: {e}[/yellow]")
+            return [None] * len(items)
+
+        analyses = self._parse_batch_analysis(response.content, names)
+        for (name, content), analysis in zip(items, analyses):
+            if analysis:
+                await self._store_cached_analysis(self._analysis_cache_key(name, content), analysis)
+        return analyses
+
+    @staticmethod
+    def _parse_batch_analysis(text: str, names: List[str]) -> List[Optional[CompanyAnalysis]]:
+        """Validate each object of a batch response separately, matching by name then position"""
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end <= start:
+            return [None] * len(names)
+        try:
+            entries = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return [None] * len(names)
+        entries = [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+
+        # Match by resolved name, each entry at most once; position is used only when no name
+        # matched at all, so one tool can never carry another tool's analysis
+        entry_keys = [entity_key(str(entry.get("name", ""))) for entry in entries]
+        matched: List[Optional[dict]] = []
+        used = set()
+        for name in names:
+            key = entity_key(name)
+            index = next((i for i, entry_key in enumerate(entry_keys) if i not in used and entry_key and entry_key == key), None)
+            if index is not None:
+                used.add(index)
+            matched.append(entries[index] if index is not None else None)
+        if not used and len(entries) == len(names):
+            matched = list(entries)
+
+        nullable = {"is_open_source", "api_available", "github_stars"}
+        analyses = []
+        for entry in matched:
+            if entry is None:
+                analyses.append(None)
+                continue
+            # Models often emit null for string/list fields; let those fall back to defaults
+            fields = {key: value for key, value in entry.items() if value is not None or key in nullable}
+            fields.pop("name", None)
+            try:
+                analyses.append(CompanyAnalysis.model_validate(fields))
+            except ValidationError:
+                analyses.append(None)
+        return analyses
+
+    async def _analyze_step(self, state: ResearchState) -> Dict[str, Any]:
         self.console.print("[bold cyan]🤖 Generating recommendations...[/bold cyan]")
 
         company_data = ", ".join([
@@ -440,37 +743,47 @@ class Workflow:
         ]
 
         try:
-            response = self._invoke_with_fallback(messages, "analysis generation")
+            response = await self._ainvoke_with_fallback(messages, "analysis generation", stream=True)
             return {"analysis": response.content}
         except Exception as e:
             self.console.print(f"[red]❌ Error generating analysis: {e}[/red]")
             return {"analysis": "Error generating analysis."}
 
     def run(self, query: str) -> ResearchState:
+        """Synchronous wrapper around arun"""
+        return run_sync(self.arun(query))
+
+    async def arun(self, query: str) -> ResearchState:
         initial_state = ResearchState(query=query)
-        final_state = self.workflow.invoke(initial_state)
+        final_state = await self.workflow.ainvoke(initial_state)
         return ResearchState(**final_state)
 
-    def get_market_leaders(self, category: str, num_results: int = 5) -> List[str]:
-        """Get top market leaders in a specific category"""
+    def get_market_leaders(self, category: str, num_results: int = 5, query: Optional[str] = None) -> List[str]:
+        """Synchronous wrapper around aget_market_leaders"""
+        return run_sync(self.aget_market_leaders(category, num_results, query))
+
+    async def aget_market_leaders(self, category: str, num_results: int = 5, query: Optional[str] = None) -> List[str]:
+        """Get top market leaders in a specific category.
+
+        `query` is the user's original query when the category was derived from it; the
+        article search is then built from it exactly as the research graph builds its own.
+        """
         try:
             self.console.print(f"[dim]📊 Finding market leaders in {category}...[/dim]")
 
-            # Search for market leader articles with developer-specific terms (aligned with main search)
-            search_query = f"best {category} developer tools 2024 top popular software engineering comparison"
-            search_results = self.firecrawl.search_companies(search_query, num_results=3)
+            # Same query and limit as the main article search, so both paths share one search
+            # and its pages
+            search_query = self._article_query(query or category)
+            search_results = await self.firecrawl.asearch_companies(search_query, num_results=4)
 
-            all_content = ""
             results_list = search_results.data if hasattr(search_results, 'data') else search_results
-            for result in results_list:
-                url = result.get("url", "")
-                scraped = self.firecrawl.scrape_company_pages(url)
-                if scraped:
-                    all_content += scraped.markdown[:2000] + "\n\n"
+            contents = [content for content in await self.firecrawl.aget_page_contents(results_list[:3]) if content]
 
             # Extract top tools using LLM with strict validation
-            messages = [
-                SystemMessage(content="""You are a senior software engineer and market analyst specializing in developer tools.
+            def build(parts):
+                all_content = "".join(part + "\n\n" for part in parts)
+                return [
+                    SystemMessage(content="""You are a senior software engineer and market analyst specializing in developer tools.
                                       Extract ONLY legitimate developer tools that are market leaders in the specified category.
 
                                       STRICT RULES:
@@ -480,11 +793,16 @@ class Workflow:
                                       - Verify each tool is relevant to the category before including
 
                                       Return only tool names, one per line, no descriptions."""),
-                HumanMessage(content=f"Category: {category}\nContent: {all_content}\n\nExtract the top 5 legitimate developer tools that are market leaders in {category}:")
-            ]
+                    HumanMessage(content=f"Category: {category}\nContent: {all_content}\n\nExtract the top 5 legitimate developer tools that are market leaders in {category}:")
+                ]
+
+            relevance_query = f"{category} {search_query} leaders tools list"
+            messages = build(self._fit_contents(
+                "market leaders extraction", build, contents, self.article_content_tokens, relevance_query
+            ))
 
             try:
-                response = self._invoke_with_fallback(messages, "market leaders extraction")
+                response = await self._ainvoke_with_fallback(messages, "market leaders extraction")
                 raw_tools = [
                     name.strip()
                     for name in response.content.strip().split("\n")
@@ -492,7 +810,9 @@ class Workflow:
                 ]
 
                 # Validate the market leaders are actually developer tools
-                validated_leaders = self._validate_developer_tools(raw_tools, category)
+                validated_leaders = await asyncio.to_thread(
+                    self._validate_developer_tools, raw_tools, category, log_as="market leaders"
+                )
                 return validated_leaders[:5]
             except Exception as e:
                 if "rate_limit" in str(e).lower() or "429" in str(e):
@@ -507,26 +827,40 @@ class Workflow:
             return []
 
     def get_detailed_analysis(self, tool_name: str, website: str) -> DetailedAnalysis:
+        """Synchronous wrapper around aget_detailed_analysis"""
+        return run_sync(self.aget_detailed_analysis(tool_name, website))
+
+    async def aget_detailed_analysis(self, tool_name: str, website: str) -> DetailedAnalysis:
         """Generate detailed analysis for a specific tool"""
         try:
             self.console.print(f"[dim]🌐 Scraping {website} for detailed information...[/dim]")
 
             # Scrape the website for detailed content
-            scraped_data = self.firecrawl.scrape_company_pages(website)
+            scraped_data = await self.firecrawl.ascrape_company_pages(website)
             if not scraped_data:
                 self.console.print(f"[red]❌ Failed to scrape {website}[/red]")
                 return None
 
             content = scraped_data.markdown if hasattr(scraped_data, 'markdown') else str(scraped_data)
+            content = self.firecrawl.clean_page(content, website)
 
             # Generate detailed analysis using LLM
-            messages = [
-                SystemMessage(content=self.prompts.DETAILED_ANALYSIS_SYSTEM),
-                HumanMessage(content=self.prompts.detailed_analysis_user(tool_name, content, ""))
-            ]
+            def build(parts):
+                return [
+                    SystemMessage(content=self.prompts.DETAILED_ANALYSIS_SYSTEM),
+                    HumanMessage(content=self.prompts.detailed_analysis_user(tool_name, parts[0], ""))
+                ]
+
+            relevance_query = (
+                f"{tool_name} overview features advantages limitations architecture performance "
+                f"integrations api documentation use cases pricing plans alternatives"
+            )
+            messages = build(self._fit_contents(
+                "detailed analysis", build, [content], self.detailed_content_tokens, relevance_query
+            ))
 
             try:
-                response = self._invoke_with_fallback(messages, "detailed analysis")
+                response = await self._ainvoke_with_fallback(messages, "detailed analysis", stream=True)
             except Exception as e:
                 self.console.print(f"[red]❌ Error generating detailed analysis: {e}[/red]")
                 return None
@@ -534,19 +868,20 @@ class Workflow:
             # Parse the response into structured format
             analysis_text = response.content
 
-            # Extract sections using simple parsing (could be enhanced with structured output)
+            # Index the markdown sections once, then fill every field from the index
+            sections = SectionIndex(analysis_text, DETAILED_ANALYSIS_SECTIONS)
             detailed_analysis = DetailedAnalysis(
                 tool_name=tool_name,
-                overview=self._extract_section(analysis_text, "## Overview"),
-                pros=self._extract_list_section(analysis_text, "### Advantages:"),
-                cons=self._extract_list_section(analysis_text, "### Disadvantages:"),
-                technical_details=self._extract_section(analysis_text, "## Technical Deep Dive"),
-                use_cases_best_for=self._extract_list_section(analysis_text, "### Best For:"),
-                use_cases_not_ideal=self._extract_list_section(analysis_text, "### Not Ideal For:"),
-                developer_experience=self._extract_section(analysis_text, "## Developer Experience"),
-                pricing_analysis=self._extract_section(analysis_text, "## Pricing & Value"),
-                alternatives_comparison=self._extract_section(analysis_text, "## Alternatives Comparison"),
-                recommendation_score=self._extract_score(analysis_text)
+                overview=sections.get("Overview"),
+                pros=sections.items("Advantages"),
+                cons=sections.items("Disadvantages"),
+                technical_details=sections.get("Technical Deep Dive"),
+                use_cases_best_for=sections.items("Best For"),
+                use_cases_not_ideal=sections.items("Not Ideal For"),
+                developer_experience=sections.get("Developer Experience"),
+                pricing_analysis=sections.get("Pricing & Value"),
+                alternatives_comparison=sections.get("Alternatives Comparison"),
+                recommendation_score=extract_score(analysis_text)
             )
 
             return detailed_analysis
@@ -556,6 +891,10 @@ class Workflow:
             return None
 
     def get_comparison_matrix(self, tools: List[CompanyInfo]) -> ComparisonMatrix:
+        """Synchronous wrapper around aget_comparison_matrix"""
+        return run_sync(self.aget_comparison_matrix(tools))
+
+    async def aget_comparison_matrix(self, tools: List[CompanyInfo]) -> ComparisonMatrix:
         """Generate comparison matrix for multiple tools"""
         try:
             tool_names = [tool.name for tool in tools]
@@ -579,7 +918,7 @@ class Workflow:
             ]
 
             try:
-                response = self._invoke_with_fallback(messages, "comparison matrix")
+                response = await self._ainvoke_with_fallback(messages, "comparison matrix", stream=True)
                 comparison_text = response.content
             except Exception as e:
                 self.console.print(f"[red]❌ Error generating comparison: {e}[/red]")
@@ -600,82 +939,3 @@ class Workflow:
         except Exception as e:
             self.console.print(f"[red]❌ Error generating comparison: {e}[/red]")
             return None
-
-    def _extract_section(self, text: str, section_header: str) -> str:
-        """Extract content from a specific section"""
-        if not text:
-            return ""
-
-        lines = text.split('\n')
-        in_section = False
-        section_content = []
-
-        # Try different header formats
-        possible_headers = [
-            section_header,
-            section_header.replace("## ", ""),
-            f"**{section_header.replace('## ', '')}**",
-            f"# {section_header.replace('## ', '')}",
-            section_header.lower(),
-            section_header.upper()
-        ]
-
-        for line in lines:
-            line_stripped = line.strip()
-
-            # Check if this line starts a section we want
-            if any(line_stripped.startswith(header) or header in line_stripped for header in possible_headers):
-                in_section = True
-                continue
-            # Check if this line starts a new section (stop extraction)
-            elif (line_stripped.startswith('##') or line_stripped.startswith('**') or line_stripped.startswith('# ')) and in_section:
-                break
-            elif in_section:
-                section_content.append(line)
-
-        result = '\n'.join(section_content).strip()
-        return result if result else ""
-
-    def _extract_list_section(self, text: str, section_header: str) -> List[str]:
-        """Extract list items from a section"""
-        section_text = self._extract_section(text, section_header)
-        if not section_text:
-            return []
-
-        items = []
-
-        for line in section_text.split('\n'):
-            line = line.strip()
-            if line.startswith('- '):
-                items.append(line[2:].strip())
-            elif line.startswith('* '):
-                items.append(line[2:].strip())
-            elif line.startswith('• '):
-                items.append(line[2:].strip())
-            elif line and not line.startswith('#') and not line.startswith('**'):
-                # If it's not a header and not empty, treat as list item
-                items.append(line)
-
-        return [item for item in items if item]  # Filter out empty items
-
-    def _extract_score(self, text: str) -> Optional[int]:
-        """Extract recommendation score from text"""
-        if not text:
-            return None
-
-        import re
-        # Try different score patterns
-        patterns = [
-            r'(\d+)/10',
-            r'score[:\s]*(\d+)',
-            r'rating[:\s]*(\d+)',
-            r'recommend[:\s]*(\d+)'
-        ]
-
-        for pattern in patterns:
-            score_match = re.search(pattern, text, re.IGNORECASE)
-            if score_match:
-                score = int(score_match.group(1))
-                if 1 <= score <= 10:  # Validate score range
-                    return score
-        return None
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script to verify matching of batched tool analyses to tool names
+"""
+
+import json
+from rich.console import Console
+from src.workflow import Workflow
+
+console = Console()
+
+
+def _response(*names: str) -> str:
+    return "Here you go:\n" + json.dumps([
+        {"name": name, "pricing_model": "Free", "description": f"about {name}"} for name in names
+    ])
+
+
+def _descriptions(text: str, names):
+    return [analysis.description if analysis else None for analysis in Workflow._parse_batch_analysis(text, names)]
+
+
+def test_reordered_entries():
+    """Entries in a different order still go to the tool they name"""
+    console.print("[bold green]🧪 Testing Reordered Batch Entries[/bold green]")
+
+    names = ["Jenkins", "CircleCI", "GitHub Actions"]
+    assert _descriptions(_response("GitHub Actions", "jenkins", "Circle CI"), names) == [
+        "about jenkins", "about Circle CI", "about GitHub Actions"
+    ]
+
+
+def test_renamed_entries():
+    """Aliases resolve by name; when no name matches at all, entries are taken by position"""
+    console.print("[bold green]🧪 Testing Renamed Batch Entries[/bold green]")
+
+    assert _descriptions(_response("Visual Studio Code", "Postgres"), ["PostgreSQL", "VS Code"]) == [
+        "about Postgres", "about Visual Studio Code"
+    ]
+    assert _descriptions(_response("Tool A", "Tool B"), ["Jenkins", "CircleCI"]) == ["about Tool A", "about Tool B"]
+
+
+def test_partial_name_matches():
+    """Unmatched tools get None instead of a leftover entry meant for another tool"""
+    console.print("[bold green]🧪 Testing Partial Batch Matches[/bold green]")
+
+    names = ["Jenkins", "CircleCI", "GitHub Actions"]
+    assert _descriptions(_response("CircleCI", "Travis", "Buildkite"), names) == [None, "about CircleCI", None]
+    assert _descriptions(_response("Jenkins", "Jenkins"), ["Jenkins", "CircleCI"]) == ["about Jenkins", None]
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]📦 Advanced Research Agent - Batch Analysis Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_reordered_entries()
+    test_renamed_entries()
+    test_partial_name_matches()
+
+    console.print(f"\n[bold green]✅ All batch analysis tests passed![/bold green]")
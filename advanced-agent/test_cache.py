@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persistent caching layer
+"""
+
+import os
+import random
+import string
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import time
+from rich.console import Console
+from src.cache import DiskCache, normalize_url, normalize_query
+
+console = Console()
+
+
+def test_url_normalization():
+    """Trivially different URLs should share one cache entry"""
+    console.print("[bold green]🧪 Testing URL Normalization[/bold green]")
+
+    variants = [
+        "https://www.supabase.com/pricing/",
+        "http://supabase.com/pricing",
+        "HTTPS://Supabase.com/pricing?utm_source=newsletter",
+        "https://supabase.com/pricing#plans",
+    ]
+    normalized = {normalize_url(url) for url in variants}
+    console.print(f"[dim]Normalized to:[/dim] {normalized}")
+    assert normalized == {"https://supabase.com/pricing"}
+
+    # Meaningful query parameters are kept (and sorted)
+    assert normalize_url("https://x.dev/search?q=a&page=2") == "https://x.dev/search?page=2&q=a"
+
+
+def test_query_normalization():
+    """Near-identical searches should map to the same cache key"""
+    console.print("[bold green]🧪 Testing Query Normalization[/bold green]")
+
+    first = normalize_query("best CI/CD developer tools 2024 comparison company pricing")
+    second = normalize_query("Best  ci/cd developer tools, 2024 comparison: company pricing.")
+    assert first == second
+    # Same words, different question
+    assert normalize_query("alternatives to Jenkins for GitLab") != normalize_query("alternatives to GitLab for Jenkins")
+    assert normalize_query("best c++ tools") != normalize_query("best c tools")
+
+
+def test_ttl_and_roundtrip():
+    """Values round-trip through compression and expire after their TTL"""
+    console.print("[bold green]🧪 Testing TTL Expiry[/bold green]")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskCache("test", ttl_seconds=60, cache_dir=cache_dir)
+        cache.set("page", "# Pricing\n" * 100)
+        assert cache.get("page") == "# Pricing\n" * 100
+
+        cache.set("short", "gone soon", ttl_seconds=0)
+        time.sleep(0.01)
+        assert cache.get("short") is None
+
+        stats = cache.stats()
+        console.print(f"[dim]Stats:[/dim] {stats}")
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_async_access_keeps_loop_responsive():
+    """aset() waiting on a write lock held by another process doesn't block other tasks"""
+    console.print("[bold green]🧪 Testing Async Cache Access[/bold green]")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskCache("test", ttl_seconds=60, cache_dir=cache_dir)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            conn = sqlite3.connect(os.path.join(cache_dir, "test.sqlite3"), isolation_level=None)
+            conn.execute("BEGIN IMMEDIATE")
+            locked.set()
+            release.wait(5)
+            conn.execute("COMMIT")
+            conn.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait(5)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            storing = asyncio.create_task(cache.aset("page", "# Pricing"))
+            await asyncio.sleep(0.3)
+            assert not storing.done()
+            release.set()
+            await storing
+            ticking.cancel()
+            return ticks, await cache.aget("page")
+
+        ticks, value = asyncio.run(main())
+        holder.join()
+        assert ticks >= 10
+        assert value == "# Pricing"
+
+
+def test_lru_eviction():
+    """Least recently used entries are evicted once the size budget is exceeded"""
+    console.print("[bold green]🧪 Testing LRU Eviction[/bold green]")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Random payloads barely compress, so each entry is roughly 2KB on disk
+        payload = lambda seed: "".join(random.Random(seed).choices(string.printable, k=2000))
+        cache = DiskCache("test", max_bytes=5000, cache_dir=cache_dir)
+
+        cache.set("a", payload(1))
+        time.sleep(0.01)
+        cache.set("b", payload(2))
+        time.sleep(0.01)
+        cache.get("a")  # touch "a" so "b" becomes least recently used
+        time.sleep(0.01)
+        cache.set("c", payload(3))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]💾 Advanced Research Agent - Cache Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_url_normalization()
+    test_query_normalization()
+    test_ttl_and_roundtrip()
+    test_async_access_keeps_loop_responsive()
+    test_lru_eviction()
+
+    console.print(f"\n[bold green]✅ All cache tests passed![/bold green]")
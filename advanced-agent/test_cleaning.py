@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify markdown boilerplate stripping
+"""
+
+from rich.console import Console
+from src.cleaning import clean_with_report
+
+console = Console()
+
+PAGE = """[Skip to content](#main)
+[![Logo](https://acme.dev/logo.png)](/)
+[Home](/) | [Pricing](/pricing) | [Docs](/docs)
+We use cookies to improve your experience. Accept all
+# Acme CI
+![hero](https://acme.dev/hero.png)
+Acme CI runs your [pipelines](https://acme.dev/pipelines) 10x faster with built-in caching.
+
+Acme CI runs your pipelines 10x faster with built-in caching.
+
+## Pricing
+| Plan | Price |
+|------|-------|
+| Free | $0 |
+| Team | $29/mo |
+- Unlimited builds
+- [Pricing starts at $29 per month for teams](/pricing)
+---
+https://acme.dev
+[Privacy Policy](/privacy) | [Terms of Service](/terms)
+© 2024 Acme Inc. All rights reserved.
+"""
+
+
+def test_strips_boilerplate():
+    """Nav, images, banners, repeats and footers go; links keep their text"""
+    console.print("[bold green]🧪 Testing Boilerplate Stripping[/bold green]")
+
+    cleaned, before, after = clean_with_report(PAGE)
+    console.print(f"[dim]{before} → {after} tokens[/dim]")
+    assert after < before / 2
+    for gone in ["Skip to content", "logo.png", "[Home]", "cookies", "Privacy Policy", "©", "https://"]:
+        assert gone not in cleaned, gone
+    assert cleaned.count("built-in caching") == 1
+
+
+def test_keeps_pricing_and_features():
+    """Pricing tables, plan details and content-bearing links survive"""
+    console.print("[bold green]🧪 Testing Content Preservation[/bold green]")
+
+    cleaned, _, _ = clean_with_report(PAGE)
+    for kept in ["# Acme CI", "runs your pipelines 10x faster", "|------|-------|", "| Team | $29/mo |",
+                 "Unlimited builds", "Pricing starts at $29 per month for teams"]:
+        assert kept in cleaned, kept
+
+    # Each tier keeps the features it shares with the tier before it
+    tiers = """## Pro
+- Priority support via email and chat
+- SSO with SAML providers
+
+**Enterprise**
+- Priority support via email and chat
+- SSO with SAML providers
+- Dedicated account manager for your team
+"""
+    cleaned, _, _ = clean_with_report(tiers)
+    assert cleaned.count("Priority support via email and chat") == 2
+    assert cleaned.count("SSO with SAML providers") == 2
+
+
+def test_keeps_linked_listicle_entries():
+    """Tool names written as linked headings or single-link bullets are content, not navigation"""
+    console.print("[bold green]🧪 Testing Linked Listicles[/bold green]")
+
+    listicle = """# Top 3 CI/CD Tools
+## [Jenkins](https://www.jenkins.io/)
+The classic self-hosted automation server.
+## 2. [CircleCI](https://circleci.com)
+- [GitHub Actions](https://github.com/features/actions)
+- [Home](/) [Blog](/blog)
+"""
+    cleaned, _, _ = clean_with_report(listicle)
+    for kept in ["## Jenkins", "## 2. CircleCI", "- GitHub Actions"]:
+        assert kept in cleaned, kept
+    assert "Blog" not in cleaned
+
+
+def test_keeps_cookie_feature_lines():
+    """Only consent phrasing is dropped; features that mention cookies stay"""
+    console.print("[bold green]🧪 Testing Cookie Lines[/bold green]")
+
+    cleaned, _, _ = clean_with_report(
+        "We use cookies to improve your experience.\n"
+        "Our cookie-based session auth supports SSO.\n"
+        "Click to accept cookies"
+    )
+    assert cleaned == "Our cookie-based session auth supports SSO."
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🧹 Advanced Research Agent - Cleaning Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_strips_boilerplate()
+    test_keeps_pricing_and_features()
+    test_keeps_linked_listicle_entries()
+    test_keeps_cookie_feature_lines()
+
+    console.print(f"\n[bold green]✅ All cleaning tests passed![/bold green]")
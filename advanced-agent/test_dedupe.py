@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test script to verify near-duplicate article detection
+"""
+
+import random
+from rich.console import Console
+from src.dedupe import minhash, near_duplicates, similarity
+
+console = Console()
+
+
+def _article(seed: int, words: int = 400) -> str:
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_syndicated_copy_detected():
+    """A lightly edited copy is flagged; a different article and short text are not"""
+    console.print("[bold green]🧪 Testing Near-Duplicate Detection[/bold green]")
+
+    original = _article(1)
+    words = original.split()
+    syndicated = " ".join(["Republished", "from", "partner", "site"] + words[:200] + ["sponsored"] + words[200:])
+    different = _article(2)
+
+    console.print(f"[dim]copy ≈ {similarity(minhash(original), minhash(syndicated)):.2f}, "
+                  f"different ≈ {similarity(minhash(original), minhash(different)):.2f}[/dim]")
+    assert near_duplicates([original, different, syndicated, "too short to judge"]) == [None, None, 0, None]
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🪞 Advanced Research Agent - Dedupe Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_syndicated_copy_detected()
+
+    console.print(f"\n[bold green]✅ All dedupe tests passed![/bold green]")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script to verify tool entity resolution
+"""
+
+from rich.console import Console
+from src.entities import EntityResolver, canonical_url, normalize_name
+
+console = Console()
+
+
+def test_name_variants_collapse():
+    """Aliases, spacing/punctuation variants and typos resolve to the first name seen"""
+    console.print("[bold green]🧪 Testing Name Resolution[/bold green]")
+
+    assert normalize_name("Node.js") == normalize_name("NodeJS")
+    assert normalize_name("CircleCI") == normalize_name("Circle CI")
+    assert normalize_name("C++") != normalize_name("C#") != normalize_name("C")
+
+    resolver = EntityResolver()
+    names = [
+        "Visual Studio Code", "GitLab", "VS Code", "vscode", "GitLab CI", "Argo CD",
+        "Next.js", "Nest.js", "PostgreSQL", "Postgres", "Kubernetes", "Kubernetess", "Jenkins"
+    ]
+    unique, merged = resolver.dedupe(names)
+    for name, kept in merged:
+        console.print(f"[dim]{name} → {kept}[/dim]")
+    assert unique == ["Visual Studio Code", "GitLab", "Argo CD", "Next.js", "Nest.js", "PostgreSQL", "Kubernetes", "Jenkins"]
+    assert ("GitLab CI", "GitLab") in merged and ("vscode", "Visual Studio Code") in merged
+
+
+def test_same_site_claimed_once():
+    """A second tool resolving to an already-claimed official site is reported as a duplicate"""
+    console.print("[bold green]🧪 Testing Canonical URL Map[/bold green]")
+
+    assert canonical_url("http://www.GitLab.com/?utm_source=x") == canonical_url("https://gitlab.com")
+
+    resolver = EntityResolver()
+    resolver.dedupe(["GitLab", "GitLab Runner", "GitHub", "GitHub Actions"])
+    assert resolver.claim_site("GitLab", "https://about.gitlab.com/") is None
+    assert resolver.claim_site("GitLab Runner", "http://about.gitlab.com") == "GitLab"
+    assert resolver.claim_site("GitHub", "https://github.com") is None
+    assert resolver.claim_site("GitHub Actions", "https://github.com/features/actions") is None
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🔗 Advanced Research Agent - Entity Resolution Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_name_variants_collapse()
+    test_same_site_claimed_once()
+
+    console.print(f"\n[bold green]✅ All entity resolution tests passed![/bold green]")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify FirecrawlService against the async SDK's response shapes
+"""
+
+import os
+import asyncio
+import tempfile
+from rich.console import Console
+from firecrawl.firecrawl import SearchResponse
+
+console = Console()
+
+HITS = [
+    {"url": "https://jenkins.io", "title": "Jenkins", "markdown": "Jenkins automation server " * 40},
+    {"url": "https://github.com/features/actions", "title": "GitHub Actions", "markdown": "Workflow automation " * 40},
+]
+
+
+class FakeAsyncApp:
+    """Returns what AsyncFirecrawlApp.search really returns: the raw JSON body"""
+
+    def __init__(self, body):
+        self.body = body
+        self.searches = 0
+
+    async def search(self, **kwargs):
+        self.searches += 1
+        return self.body
+
+
+def _service(tmpdir, body):
+    os.environ["CACHE_DIR"] = tmpdir
+    try:
+        from src.firecrawl import FirecrawlService
+        service = FirecrawlService()
+    finally:
+        del os.environ["CACHE_DIR"]
+    service.async_app = FakeAsyncApp(body)
+    service.requests_per_minute = 10_000
+    service.retry_policy.max_attempts = 1
+    return service
+
+
+def test_search_wraps_raw_body():
+    """Search hits come back as a SearchResponse and are served from the search cache next time"""
+    console.print("[bold green]🧪 Testing Firecrawl Search Response[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service = _service(tmpdir, {"success": True, "data": HITS})
+        result = asyncio.run(service.asearch_companies("CI/CD tools", 2))
+        assert isinstance(result, SearchResponse)
+        assert [hit["url"] for hit in result.data] == [hit["url"] for hit in HITS]
+
+        cached = asyncio.run(service.asearch_companies("CI/CD tools", 2))
+        assert cached.data == result.data
+        assert service.async_app.searches == 1
+        assert len(asyncio.run(service.aget_page_contents(result.data))) == 2
+
+
+def test_search_error_body_fails():
+    """An error body is treated as a failed search, not as a list of hits"""
+    console.print("[bold green]🧪 Testing Firecrawl Search Errors[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service = _service(tmpdir, {"success": False, "error": "Insufficient credits"})
+        assert asyncio.run(service.asearch_companies("CI/CD tools", 2)) == []
+
+
+def test_market_leaders_share_article_search():
+    """Market leaders and tool extraction run the same article search for every query form"""
+    console.print("[bold green]🧪 Testing Shared Article Search[/bold green]")
+
+    from src.models import ResearchState
+    from src.workflow import Workflow
+
+    os.environ["CACHE_ENABLED"] = "false"
+    try:
+        workflow = Workflow()
+    finally:
+        del os.environ["CACHE_ENABLED"]
+    searches = []
+
+    async def search(query, num_results=5):
+        searches.append((query, num_results))
+        return SearchResponse(success=True, data=[])
+
+    async def no_llm(*args, **kwargs):
+        raise Exception("Invalid API key")
+
+    workflow.firecrawl.asearch_companies = search
+    workflow._ainvoke_with_fallback = no_llm
+    for query in ["alternative to Jenkins", "tools for python testing", "CI/CD platforms"]:
+        category = query.replace("alternate for", "").replace("alternative to", "").replace("tools for", "").strip()
+        searches.clear()
+        asyncio.run(workflow._extract_tools_step(ResearchState(query=query)))
+        asyncio.run(workflow.aget_market_leaders(category, query=query))
+        assert searches[0] == searches[1], searches
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🔥 Advanced Research Agent - Firecrawl Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_search_wraps_raw_body()
+    test_search_error_body_fails()
+    test_market_leaders_share_article_search()
+
+    console.print(f"\n[bold green]✅ All Firecrawl tests passed![/bold green]")
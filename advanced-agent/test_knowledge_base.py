@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the local knowledge base of researched tools
+"""
+
+import os
+import tempfile
+from rich.console import Console
+from src.knowledge_base import KnowledgeBase
+from src.models import CompanyInfo
+
+console = Console()
+
+
+def _tool(name: str, website: str, description: str, tech=(), languages=(), competitors=()) -> CompanyInfo:
+    return CompanyInfo(
+        name=name, description=description, website=website, pricing_model="Freemium",
+        tech_stack=list(tech), language_support=list(languages), competitors=list(competitors)
+    )
+
+
+def test_lookup_and_freshness():
+    """Entries are found by any spelling or by site, and go stale with age or a new prompt"""
+    console.print("[bold green]🧪 Testing Knowledge Base Lookup[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        kb = KnowledgeBase(os.path.join(tmpdir, "kb.sqlite3"), max_age_seconds=3600)
+        kb.upsert(_tool("Visual Studio Code", "https://code.visualstudio.com/", "Code editor"), "h1", "v1")
+
+        entry = kb.get("VS Code")
+        assert entry and entry.company.name == "Visual Studio Code"
+        assert kb.get_by_site("http://www.code.visualstudio.com").content_hash == "h1"
+        assert kb.is_fresh(entry, "v1") and not kb.is_fresh(entry, "v2")
+        assert not kb.is_fresh(entry._replace(researched_at=entry.researched_at - 7200), "v1")
+        assert kb.get("Sublime Text") is None
+
+
+def test_facet_search_and_alternatives():
+    """Category, stack and language filters and "alternatives to X" answer from the local index"""
+    console.print("[bold green]🧪 Testing Knowledge Base Search[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        kb = KnowledgeBase(os.path.join(tmpdir, "kb.sqlite3"))
+        kb.upsert(_tool("Jenkins", "https://jenkins.io", "Automation server with pipelines", ["Java"], ["Java", "Python"]),
+                  "h", "v")
+        kb.upsert(_tool("GitHub Actions", "https://github.com/features/actions", "Workflow automation", ["YAML"],
+                        ["Python", "Go"], ["Jenkins"]), "h", "v")
+        kb.upsert(_tool("Buildkite", "https://buildkite.com", "Pipelines on your own agents", ["Go"], ["Go"]),
+                  "h", "v")
+        kb.upsert(_tool("PostgreSQL", "https://postgresql.org", "Relational database", ["C"], ["Python", "Go"]),
+                  "h", "v")
+
+        names = lambda companies: [company.name for company in companies]
+        assert set(names(kb.search(category="ci/cd"))) == {"Jenkins", "GitHub Actions", "Buildkite"}
+        assert set(names(kb.search(category="DevOps & Infrastructure", language="python"))) == {"GitHub Actions", "Jenkins"}
+        assert names(kb.search(tech="go")) == ["Buildkite"]
+        assert set(names(kb.search("pipelines"))) == {"Jenkins", "Buildkite"}
+
+        alternatives = names(kb.alternatives("Jenkins"))
+        console.print(f"[dim]alternatives to Jenkins: {', '.join(alternatives)}[/dim]")
+        assert alternatives[0] == "GitHub Actions" and "PostgreSQL" not in alternatives
+        assert "Buildkite" in alternatives
+        assert names(kb.alternatives("Travis CI")) == []
+
+
+def test_categories_follow_the_tool():
+    """Categories come from the tool itself and are replaced, not accumulated, on each upsert"""
+    console.print("[bold green]🧪 Testing Knowledge Base Categories[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        kb = KnowledgeBase(os.path.join(tmpdir, "kb.sqlite3"))
+        kb.upsert(_tool("Kestrel", "https://kestrel.dev", "In-memory database and cache"), "h1", "v")
+        assert kb.get("Kestrel").categories == ["Databases & Storage"]
+
+        kb.upsert(_tool("Kestrel", "https://kestrel.dev", "Message broker with pipelines for deployment jobs"), "h2", "v")
+        assert kb.get("Kestrel").categories == ["DevOps & Infrastructure"]
+        assert kb.search(category="database") == []
+        # Words that merely contain a pattern ("ide" in "provides") don't tag a tool
+        kb.upsert(_tool("Acme", "https://acme.dev", "Provides widgets"), "h", "v")
+        assert kb.get("Acme").categories == []
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]📚 Advanced Research Agent - Knowledge Base Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_lookup_and_freshness()
+    test_facet_search_and_alternatives()
+    test_categories_follow_the_tool()
+
+    console.print(f"\n[bold green]✅ All knowledge base tests passed![/bold green]")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compiled tool-name matcher
+"""
+
+import os
+import json
+import random
+import tempfile
+from rich.console import Console
+from src.matcher import PatternMatcher
+from src.validation import DEFAULT_RULES_PATH, Rulebook, classify_tools
+
+console = Console()
+
+
+def test_matcher_agrees_with_substring_checks():
+    """One automaton pass gives the same labels as per-pattern `in` checks"""
+    console.print("[bold green]🧪 Testing Aho-Corasick Matcher[/bold green]")
+
+    rng = random.Random(3)
+    for _ in range(200):
+        rules = {
+            f"class{i}": ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 5))]
+            for i in range(5)
+        }
+        matcher = PatternMatcher(rules)
+        for _ in range(20):
+            text = "".join(rng.choice("abcd ") for _ in range(rng.randint(0, 15)))
+            expected = {label for label, patterns in rules.items() if any(p in text for p in patterns)}
+            assert matcher.labels(text) == expected
+
+
+def test_batch_classification():
+    """Batch verdicts follow the validation rules, in input order"""
+    console.print("[bold green]🧪 Testing Batch Classification[/bold green]")
+
+    names = ["Jenkins", "Rolex Watch Store", "Weather Monitor", "Datadog Monitor", "VS Code", "x"] * 500
+    verdicts = classify_tools(names, "ci/cd tools")
+    assert len(verdicts) == len(names)
+    assert [v.verdict for v in verdicts[:6]] == ["validated", "excluded", "uncertain", "validated", "validated", "skipped"]
+    assert "known" in verdicts[0].matched
+    assert verdicts[1].trace == ("exclude:watch", "hard_exclude:watch")
+    assert verdicts[2].trace == ("ambiguous:weather without strong indicator",)
+
+
+def test_rulebook_hot_reload():
+    """Editing the rules file changes verdicts without rebuilding anything by hand"""
+    console.print("[bold green]🧪 Testing Rulebook Reload[/bold green]")
+
+    with open(DEFAULT_RULES_PATH, encoding="utf-8") as f:
+        rules = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "rules.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rules, f)
+        rulebook = Rulebook(path)
+        assert rulebook.classify_many(["Jenkins"], "ci/cd")[0].verdict == "validated"
+
+        rules["version"] += 1
+        rules["exclude"]["Retired"] = ["jenkins"]
+        rules["hard_exclude"].append("jenkins")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rules, f)
+        os.utime(path, (rulebook.mtime + 5, rulebook.mtime + 5))
+
+        assert rulebook.reload_if_changed()
+        verdict = rulebook.classify_many(["Jenkins"], "ci/cd")[0]
+        console.print(f"[dim]v{verdict.rules_version}: {verdict.verdict} ({'; '.join(verdict.trace)})[/dim]")
+        assert verdict.verdict == "excluded" and verdict.rules_version == rules["version"]
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🧩 Advanced Research Agent - Matcher Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_matcher_agrees_with_substring_checks()
+    test_batch_classification()
+    test_rulebook_hot_reload()
+
+    console.print(f"\n[bold green]✅ All matcher tests passed![/bold green]")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared token-bucket rate limiter
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from rich.console import Console
+from src.rate_limit import RateLimiter
+
+console = Console()
+
+
+def test_bucket_grants_then_waits():
+    """A full bucket grants up to its capacity, then reports how long to wait"""
+    console.print("[bold green]🧪 Testing Token Bucket[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        limiter = RateLimiter(os.path.join(tmpdir, "buckets.sqlite3"))
+        assert limiter.try_acquire("api", per_minute=60, amount=60) == 0
+        assert 0.9 < limiter.try_acquire("api", per_minute=60, amount=1) <= 1.0
+
+
+def test_contended_acquire_keeps_loop_responsive():
+    """While another process holds the bucket lock, other tasks keep running"""
+    console.print("[bold green]🧪 Testing Lock Contention[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "buckets.sqlite3")
+        limiter = RateLimiter(path)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            conn = sqlite3.connect(path, isolation_level=None)
+            conn.execute("BEGIN IMMEDIATE")
+            locked.set()
+            release.wait(5)
+            conn.execute("COMMIT")
+            conn.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait(5)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            acquiring = asyncio.create_task(limiter.acquire("api", per_minute=60))
+            await asyncio.sleep(0.3)
+            assert not acquiring.done()
+            release.set()
+            started = time.monotonic()
+            await acquiring
+            ticking.cancel()
+            console.print(f"[dim]{ticks} ticks while waiting for the lock, granted {time.monotonic() - started:.2f}s after release[/dim]")
+            return ticks
+
+        try:
+            assert asyncio.run(main()) >= 10
+        finally:
+            release.set()
+            holder.join()
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🪣 Advanced Research Agent - Rate Limiter Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_bucket_grants_then_waits()
+    test_contended_acquire_keeps_loop_responsive()
+
+    console.print(f"\n[bold green]✅ All rate limiter tests passed![/bold green]")
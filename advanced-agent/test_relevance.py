@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script to verify relevance-ranked chunk selection
+"""
+
+from rich.console import Console
+from src.relevance import select_relevant, split_chunks
+from src.tokens import estimate_tokens
+
+console = Console()
+
+LISTICLE = "\n\n".join(
+    ["# The Best CI/CD Tools in 2024", "We looked at dozens of products over the past year. " * 30]
+    + [f"## Our team's story\n" + "Company history, hiring, offices and culture. " * 25]
+    + [
+        f"## {i}. {name}\n{name} is a CI/CD platform for running pipelines, builds and deployments. Pricing starts free."
+        for i, name in enumerate(["Jenkins", "GitHub Actions", "CircleCI", "GitLab CI"], 1)
+    ]
+)
+
+
+def test_split_keeps_headers():
+    """Long sections are split into pieces that repeat their header"""
+    console.print("[bold green]🧪 Testing Chunk Splitting[/bold green]")
+
+    chunks = split_chunks(LISTICLE, max_chunk_tokens=60)
+    assert all(estimate_tokens(chunk) <= 80 for chunk in chunks)
+    assert sum(chunk.startswith("## Our team's story") for chunk in chunks) > 1
+
+
+def test_selects_tool_list_over_intro():
+    """The tool list at the end of a listicle survives where a prefix cut would drop it"""
+    console.print("[bold green]🧪 Testing Relevance Selection[/bold green]")
+
+    selected = select_relevant(LISTICLE, "best ci/cd tools pipelines pricing", max_tokens=150)
+    console.print(f"[dim]{estimate_tokens(LISTICLE)} → {estimate_tokens(selected)} tokens[/dim]")
+    assert estimate_tokens(selected) <= 150
+    for name in ["Jenkins", "GitHub Actions", "CircleCI", "GitLab CI"]:
+        assert name in selected
+    assert "Our team's story" not in selected
+    # Selected chunks keep document order
+    assert selected.index("Jenkins") < selected.index("GitLab CI")
+
+
+def test_short_content_unchanged():
+    """Content that already fits the budget is returned as-is"""
+    assert select_relevant("## Pricing\nFree forever", "pricing", max_tokens=100) == "## Pricing\nFree forever"
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🎯 Advanced Research Agent - Relevance Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_split_keeps_headers()
+    test_selects_tool_list_over_intro()
+    test_short_content_unchanged()
+
+    console.print(f"\n[bold green]✅ All relevance tests passed![/bold green]")
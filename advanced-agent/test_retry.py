@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Firecrawl retry policy and circuit breaker
+"""
+
+import asyncio
+from rich.console import Console
+from src.retry import CircuitBreaker, CircuitOpenError, RetryPolicy, classify_error, retry_after_seconds
+
+console = Console()
+
+
+def test_error_classification():
+    """Errors are sorted into rate limits, transient failures and fatal ones"""
+    console.print("[bold green]🧪 Testing Error Classification[/bold green]")
+
+    cases = [
+        (Exception("Unexpected error during search: Status code 429. Rate limit exceeded"), "rate_limit"),
+        (Exception("Unexpected error during scrape URL: Status code 502. Bad gateway"), "transient"),
+        (Exception("Internal Server Error: Failed to scrape URL."), "transient"),
+        (asyncio.TimeoutError(), "transient"),
+        (Exception("Payment Required: Failed to search. Insufficient credits"), "fatal"),
+        (Exception("Website Not Supported: Failed to scrape URL."), "fatal"),
+    ]
+    for error, expected in cases:
+        kind = classify_error(error)
+        console.print(f"[dim]{str(error)[:60] or type(error).__name__} → {kind}[/dim]")
+        assert kind == expected
+
+
+def test_retry_after_parsing():
+    """Retry-After is read from the error message when there are no headers"""
+    console.print("[bold green]🧪 Testing Retry-After Parsing[/bold green]")
+
+    assert retry_after_seconds(Exception("Rate limit exceeded. Retry after 12s")) == 12
+    assert retry_after_seconds(Exception("Please try again in 1.5m")) == 90
+    assert retry_after_seconds(Exception("Status code 500")) is None
+
+
+def test_circuit_breaker_fails_fast():
+    """Once the breaker opens, later calls fail without touching the endpoint"""
+    console.print("[bold green]🧪 Testing Circuit Breaker[/bold green]")
+
+    calls = []
+
+    async def failing_call():
+        calls.append(1)
+        raise Exception("Unexpected error during search: Status code 503")
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+
+    async def scenario():
+        try:
+            await policy.run(failing_call, breaker)
+        except Exception as e:
+            assert not isinstance(e, CircuitOpenError)
+        try:
+            await policy.run(failing_call, breaker)
+            assert False, "expected the circuit to be open"
+        except CircuitOpenError:
+            pass
+
+    asyncio.run(scenario())
+    console.print(f"[dim]Endpoint calls: {len(calls)}, breaker state: {breaker.state}[/dim]")
+    assert len(calls) == 3 and breaker.state == "open"
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🔁 Advanced Research Agent - Retry Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_error_classification()
+    test_retry_after_parsing()
+    test_circuit_breaker_fails_fast()
+
+    console.print(f"\n[bold green]✅ All retry tests passed![/bold green]")
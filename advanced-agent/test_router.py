@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test script to verify latency- and health-aware model routing
+"""
+
+import os
+import asyncio
+import tempfile
+from rich.console import Console
+from src.router import ModelRouter, classify_llm_error, parse_duration
+
+console = Console()
+
+MODELS = ["fast-model", "slow-model", "backup-model"]
+
+
+def _router(tmpdir):
+    return ModelRouter(MODELS, state_path=os.path.join(tmpdir, "router.json"))
+
+
+def test_reset_duration_parsing():
+    """Groq reset headers are parsed into seconds"""
+    console.print("[bold green]🧪 Testing Reset Duration Parsing[/bold green]")
+
+    assert parse_duration("2m59.56s") == 179.56
+    assert parse_duration("120ms") == 0.12
+    assert parse_duration("7") == 7
+    assert parse_duration("") is None
+
+
+def test_routes_by_latency_and_health():
+    """The fastest healthy model wins; rate-limited and decommissioned models are skipped"""
+    console.print("[bold green]🧪 Testing Model Routing[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        router = _router(tmpdir)
+        assert router.choose("analysis") == "fast-model"
+
+        router.record_success("fast-model", 4.0, "analysis")
+        router.record_success("slow-model", 1.0, "analysis")
+        assert router.choose("analysis") == "slow-model"
+
+        kind = router.record_error("slow-model", Exception("Error code: 429 - rate_limit_exceeded. Please try again in 20s"))
+        assert kind == "rate_limit"
+        assert router.choose("analysis") == "fast-model"
+        assert 0 < router.next_available_in(exclude={"fast-model", "backup-model"}) <= 20
+
+        kind = router.record_error("fast-model", Exception("The model `fast-model` has been decommissioned"))
+        assert kind == "unavailable"
+        assert router.choose("analysis") == "backup-model"
+
+        assert classify_llm_error(Exception("Invalid API key")) == "fatal"
+        assert classify_llm_error(Exception("Error code: 400 - invalid_request_error")) == "fatal"
+        assert classify_llm_error(asyncio.TimeoutError()) == "transient"
+        assert classify_llm_error(Exception("Connection error.")) == "transient"
+
+        # Health and latency survive a restart
+        restored = _router(tmpdir)
+        console.print(f"[dim]{restored.stats()}[/dim]")
+        assert not restored.is_available("fast-model")
+        assert not restored.is_available("slow-model")
+        assert restored.choose("analysis") == "backup-model"
+
+
+def test_state_writes_are_throttled():
+    """Latency samples are written at most once per interval, health changes at once, nothing when disabled"""
+    console.print("[bold green]🧪 Testing Router Persistence[/bold green]")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "router.json")
+        router = ModelRouter(MODELS, state_path=path, persist=True, save_interval=3600)
+        router.record_success("fast-model", 1.0, "analysis")
+        first_write = os.path.getmtime(path)
+        os.utime(path, (first_write - 100, first_write - 100))
+        router.record_success("fast-model", 2.0, "analysis")
+        assert os.path.getmtime(path) == first_write - 100
+        router.flush()
+        assert len(ModelRouter(MODELS, state_path=path).state["fast-model"]["latencies"]) == 2
+
+        router.record_error("slow-model", Exception("429 rate_limit_exceeded"))
+        assert not ModelRouter(MODELS, state_path=path).is_available("slow-model")
+
+        memory_only = os.path.join(tmpdir, "memory.json")
+        ModelRouter(MODELS, state_path=memory_only, persist=False).record_success("fast-model", 1.0)
+        assert not os.path.exists(memory_only)
+
+
+def test_short_cooldowns_do_not_loop_forever():
+    """Models that keep rate limiting with tiny cooldowns exhaust the attempt budget"""
+    console.print("[bold green]🧪 Testing Attempt Cap[/bold green]")
+
+    from src.workflow import Workflow
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["CACHE_ENABLED"] = "false"
+        try:
+            workflow = Workflow()
+        finally:
+            del os.environ["CACHE_ENABLED"]
+        workflow.router = ModelRouter(MODELS, state_path=os.path.join(tmpdir, "router.json"), persist=False)
+        calls = []
+
+        async def always_rate_limited(model, *args, **kwargs):
+            calls.append(model)
+            error = Exception("Error code: 429 - rate_limit_exceeded. Please try again in 0.01s")
+            workflow.router.record_error(model, error)
+            raise error
+
+        workflow._ainvoke_hedged = always_rate_limited
+        try:
+            asyncio.run(workflow._ainvoke_models([], "analysis"))
+            assert False, "expected the request to give up"
+        except Exception as e:
+            assert "All models failed" in str(e)
+        assert len(calls) == workflow.max_model_attempts
+
+
+def test_hedge_waits_for_the_primary_budget():
+    """A primary call still queued for rate-limit budget doesn't trigger a hedge"""
+    console.print("[bold green]🧪 Testing Hedge Timing[/bold green]")
+
+    from langchain_core.messages import AIMessage
+    from src.workflow import Workflow
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["CACHE_ENABLED"] = "false"
+        try:
+            workflow = Workflow()
+        finally:
+            del os.environ["CACHE_ENABLED"]
+        workflow.router = ModelRouter(MODELS, state_path=os.path.join(tmpdir, "router.json"), persist=False)
+        workflow.hedge_requests = True
+        workflow.router.latency_percentile = lambda *args, **kwargs: 0.05
+        called = []
+
+        class FakeLLM:
+            def __init__(self, model):
+                self.model = model
+
+            async def ainvoke(self, messages):
+                called.append(self.model)
+                return AIMessage(content=self.model)
+
+        async def slow_budget(model, messages):
+            called.append(f"budget:{model}")
+            await asyncio.sleep(0.2)
+
+        workflow._llm_for = FakeLLM
+        workflow._acquire_llm_budget = slow_budget
+        model, response = asyncio.run(workflow._ainvoke_hedged("fast-model", [], "analysis", None, set()))
+        assert (model, response.content) == ("fast-model", "fast-model")
+        # Only the primary asked for budget, so no second model was started while it queued
+        assert called == ["budget:fast-model", "fast-model"]
+
+
+def test_overloaded_model_falls_through():
+    """A 503 cools the model down briefly and the request moves on to the next model"""
+    console.print("[bold green]🧪 Testing Transient Model Errors[/bold green]")
+
+    from src.workflow import Workflow
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["CACHE_ENABLED"] = "false"
+        try:
+            workflow = Workflow()
+        finally:
+            del os.environ["CACHE_ENABLED"]
+        workflow.router = ModelRouter(MODELS, state_path=os.path.join(tmpdir, "router.json"), persist=False)
+        calls = []
+
+        async def overloaded_first(model, *args, **kwargs):
+            calls.append(model)
+            if model == "fast-model":
+                error = Exception("Error code: 503 - {'error': {'message': 'fast-model is currently over capacity'}}")
+                assert workflow.router.record_error(model, error) == "transient"
+                raise error
+            return model, model
+
+        workflow._ainvoke_hedged = overloaded_first
+        assert asyncio.run(workflow._ainvoke_models([], "analysis")) == "slow-model"
+        assert calls == ["fast-model", "slow-model"]
+        assert not workflow.router.is_available("fast-model")
+        assert 0 < workflow.router.next_available_in(exclude={"slow-model", "backup-model"}) <= 10
+
+
+def test_cached_answer_skips_routing():
+    """A cached answer from a cooling-down model is replayed with no budget taken and no call made"""
+    console.print("[bold green]🧪 Testing Cached Responses Across Models[/bold green]")
+
+    from langchain_core.messages import AIMessage, HumanMessage
+    from src.workflow import Workflow
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["CACHE_DIR"] = tmpdir
+        try:
+            workflow = Workflow()
+        finally:
+            del os.environ["CACHE_DIR"]
+        workflow.router = ModelRouter(MODELS, state_path=os.path.join(tmpdir, "router.json"), persist=False)
+        messages = [HumanMessage(content="Recommend a CI tool")]
+        asyncio.run(workflow._store_cached_response("fast-model", messages, AIMessage(content="Use Jenkins")))
+        workflow.router.record_error("fast-model", Exception("429 rate_limit_exceeded. Please try again in 60s"))
+        assert workflow.router.choose("recommendations") != "fast-model"
+
+        acquired = []
+
+        class Limiter:
+            async def acquire(self, *args, **kwargs):
+                acquired.append(args)
+
+        def no_llm(model):
+            raise AssertionError(f"called {model}")
+
+        workflow.rate_limiter = Limiter()
+        workflow._llm_for = no_llm
+        response = asyncio.run(workflow._ainvoke_models(messages, "recommendations"))
+        assert response.content == "Use Jenkins"
+        assert acquired == []
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🧭 Advanced Research Agent - Model Router Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_reset_duration_parsing()
+    test_routes_by_latency_and_health()
+    test_state_writes_are_throttled()
+    test_short_cooldowns_do_not_loop_forever()
+    test_hedge_waits_for_the_primary_budget()
+    test_overloaded_model_falls_through()
+    test_cached_answer_skips_routing()
+
+    console.print(f"\n[bold green]✅ All router tests passed![/bold green]")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the markdown section indexer used for detailed analyses
+"""
+
+import time
+import random
+from rich.console import Console
+from src.sections import DETAILED_ANALYSIS_SECTIONS, SectionIndex, extract_score
+
+console = Console()
+
+SAMPLE = """## Overview
+Jenkins is an open-source automation server.
+
+### Advantages:
+- Huge plugin ecosystem
+- Self-hosted and free
+
+### Disadvantages:
+- Dated UI
+* Plugin maintenance burden
+
+## Technical Deep Dive
+Java-based controller/agent architecture.
+
+### Best For:
+- Teams needing full control
+
+### Not Ideal For:
+- Small teams wanting zero maintenance
+
+## Developer Experience
+Steep learning curve, large community.
+
+## Pricing & Value
+Free; infrastructure costs only.
+
+## Alternatives Comparison
+GitHub Actions and GitLab CI are easier to start with.
+
+Recommendation score: 7/10
+"""
+
+
+def test_prompt_format():
+    """Every field of the prompt's exact structure is recovered"""
+    console.print("[bold green]🧪 Testing Section Index[/bold green]")
+
+    sections = SectionIndex(SAMPLE, DETAILED_ANALYSIS_SECTIONS)
+    assert sections.get("Overview") == "Jenkins is an open-source automation server."
+    assert sections.items("Advantages") == ["Huge plugin ecosystem", "Self-hosted and free"]
+    assert sections.items("Disadvantages") == ["Dated UI", "Plugin maintenance burden"]
+    assert sections.items("Not Ideal For") == ["Small teams wanting zero maintenance"]
+    assert sections.get("Pricing & Value") == "Free; infrastructure costs only."
+    assert sections.get("Alternatives Comparison").startswith("GitHub Actions")
+    assert extract_score(SAMPLE) == 7
+
+
+def test_header_variants():
+    """Bold, numbered, plain and renamed headers map onto the same fields"""
+    console.print("[bold green]🧪 Testing Header Variants[/bold green]")
+
+    text = """# Jenkins Overview
+Automation server.
+
+**Pros:**
+1. Plugins
+2. Free
+
+Cons:
+- Dated UI
+**Note:** plugins need care
+
+### 4. Ideal For
+- Large teams
+
+#### When not to use
+- Tiny projects
+
+**Pricing**
+Free.
+"""
+    sections = SectionIndex(text, DETAILED_ANALYSIS_SECTIONS)
+    assert sections.get("Overview") == "Automation server."
+    assert sections.items("Advantages") == ["Plugins", "Free"]
+    assert sections.items("Disadvantages") == ["Dated UI"]
+    assert sections.items("Best For") == ["Large teams"]
+    assert sections.items("Not Ideal For") == ["Tiny projects"]
+    assert sections.get("Pricing & Value") == "Free."
+    assert sections.get("Developer Experience") == ""
+
+
+def test_plain_lines_need_a_colon():
+    """A body line that happens to be a section name doesn't split the section"""
+    console.print("[bold green]🧪 Testing Plain Header Lines[/bold green]")
+
+    text = """## Overview
+Jenkins is an automation server.
+Value
+It is free to self-host.
+
+## Developer Experience
+Steep learning curve.
+Summary:
+Powerful once configured.
+
+## Alternatives Comparison
+GitHub Actions is easier to start with.
+Pricing:
+Both are free for open source.
+
+## Pricing & Value
+Free.
+"""
+    sections = SectionIndex(text, DETAILED_ANALYSIS_SECTIONS)
+    assert sections.get("Overview").endswith("It is free to self-host.")
+    assert "Value" in sections.get("Overview")
+    assert sections.get("Developer Experience").endswith("Powerful once configured.")
+    assert sections.get("Alternatives Comparison").endswith("Both are free for open source.")
+    assert sections.get("Pricing & Value") == "Free."
+
+    # Without ATX headers, "Name:" lines are the headers
+    plain = SectionIndex("Overview:\nAutomation server.\nPricing:\nFree.", DETAILED_ANALYSIS_SECTIONS)
+    assert plain.get("Overview") == "Automation server."
+    assert plain.get("Pricing & Value") == "Free."
+
+
+def test_fuzzed_layouts():
+    """Random header styles, section order and filler still give every field back"""
+    console.print("[bold green]🧪 Fuzzing Section Layouts[/bold green]")
+
+    rng = random.Random(7)
+    # Plain "Name:" headers only appear in responses that don't use ATX headers
+    families = [["## {}", "### {}:", "**{}**", "**{}:**", "# 1. {}"], ["**{}**", "**{}:**", "{}:"]]
+    for _ in range(300):
+        styles = rng.choice(families)
+        names = list(DETAILED_ANALYSIS_SECTIONS)
+        rng.shuffle(names)
+        lines, expected = ["Intro text before any header."], {}
+        for name in names:
+            spelling = rng.choice([name, *DETAILED_ANALYSIS_SECTIONS[name]])
+            lines.append(rng.choice(styles).format(spelling.title()))
+            body = [f"- {name} point {i}" for i in range(rng.randint(1, 4))]
+            lines.extend(body)
+            lines.append("")
+            expected[name] = [line[2:] for line in body]
+        sections = SectionIndex("\n".join(lines), DETAILED_ANALYSIS_SECTIONS)
+        for name, items in expected.items():
+            assert sections.items(name) == items, (name, lines)
+
+
+def test_large_output():
+    """Parsing time grows linearly with the size of the response"""
+    console.print("[bold green]🧪 Benchmarking Large Outputs[/bold green]")
+
+    timings = {}
+    for repeat in (10, 100, 1000):
+        text = SAMPLE * repeat
+        elapsed = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            sections = SectionIndex(text, DETAILED_ANALYSIS_SECTIONS)
+            elapsed = min(elapsed, time.perf_counter() - started)
+        assert sections.items("Advantages") == ["Huge plugin ecosystem", "Self-hosted and free"]
+        console.print(f"[dim]{len(text):>9,} chars: {elapsed * 1000:.1f} ms[/dim]")
+        timings[repeat] = elapsed
+
+    # 10x the text should take about 10x as long; quadratic parsing would take ~100x
+    assert timings[1000] < timings[100] * 30, timings
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]📑 Advanced Research Agent - Section Parsing Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_prompt_format()
+    test_header_variants()
+    test_plain_lines_need_a_colon()
+    test_fuzzed_layouts()
+    test_large_output()
+
+    console.print(f"\n[bold green]✅ All section parsing tests passed![/bold green]")
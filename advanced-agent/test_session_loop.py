@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that sync entry points share one long-lived event loop
+"""
+
+import asyncio
+from rich.console import Console
+from src.utils import get_session_loop, run_sync
+
+console = Console()
+
+
+def test_calls_share_one_loop():
+    """Consecutive run_sync calls run on the same loop, so loop-bound objects stay usable"""
+    console.print("[bold green]🧪 Testing Session Loop Reuse[/bold green]")
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first, second = run_sync(current_loop()), run_sync(current_loop())
+    assert first is second is get_session_loop()
+
+    # Stands in for a cached async client: a queue binds to the loop it first runs on
+    queue = asyncio.Queue()
+
+    async def put_then_get(value):
+        await queue.put(value)
+        return await queue.get()
+
+    assert run_sync(put_then_get("first query")) == "first query"
+    assert run_sync(put_then_get("second query")) == "second query"
+
+
+def test_works_inside_a_running_loop():
+    """Called from another running loop (a notebook), the coroutine still lands on the session loop"""
+    console.print("[bold green]🧪 Testing Session Loop From Async Code[/bold green]")
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    async def caller():
+        return run_sync(current_loop())
+
+    assert asyncio.run(caller()) is get_session_loop()
+
+    async def nested():
+        return run_sync(current_loop())
+
+    try:
+        run_sync(nested())
+    except RuntimeError as e:
+        assert "session loop" in str(e)
+    else:
+        raise AssertionError("run_sync on the session loop should refuse instead of deadlocking")
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🔁 Advanced Research Agent - Session Loop Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_calls_share_one_loop()
+    test_works_inside_a_running_loop()
+
+    console.print(f"\n[bold green]✅ All session loop tests passed![/bold green]")
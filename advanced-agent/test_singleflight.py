@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test script to verify coalescing of concurrent identical requests
+"""
+
+import asyncio
+from rich.console import Console
+from src.singleflight import SingleFlight
+
+console = Console()
+
+
+def test_coalesces_only_while_in_flight():
+    """Concurrent callers share one fetch; a later caller fetches again instead of reading a memo"""
+    console.print("[bold green]🧪 Testing Single-Flight Coalescing[/bold green]")
+
+    flight, fetches = SingleFlight(), []
+
+    async def fetch():
+        fetches.append(1)
+        await asyncio.sleep(0.01)
+        return f"page {len(fetches)}"
+
+    async def scenario():
+        together = await asyncio.gather(*(flight.do("url", fetch) for _ in range(5)))
+        later = await flight.do("url", fetch)
+        return together, later
+
+    together, later = asyncio.run(scenario())
+    assert together == ["page 1"] * 5
+    assert later == "page 2"
+    assert flight.stats() == {"calls": 2, "coalesced": 4}
+    assert not flight._futures
+
+
+if __name__ == "__main__":
+    console.print("[bold magenta]🛫 Advanced Research Agent - Single-Flight Testing[/bold magenta]")
+    console.print("=" * 70)
+
+    test_coalesces_only_while_in_flight()
+
+    console.print(f"\n[bold green]✅ All single-flight tests passed![/bold green]")